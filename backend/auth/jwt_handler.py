@@ -3,10 +3,20 @@ JWT token handling utilities for authentication.
 Handles token creation, validation, and user authentication.
 """
 
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+import orjson
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import bcrypt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
@@ -21,35 +31,77 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))  # 24 hours
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The JWT header never changes, so it is encoded once: base64url('{"alg":"HS256","typ":"JWT"}')
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+_HEADER_SEGMENT = base64.urlsafe_b64encode(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"})).rstrip(b"=")
+
+# Password hashing: new hashes use Argon2id, existing bcrypt hashes still verify
+_argon2 = PasswordHasher(
+    time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    memory_cost=int(os.getenv("ARGON2_MEMORY_COST", "19456")),  # KiB
+    parallelism=1,
+)
+
+# Hash of a discarded random password, made with the configured Argon2 parameters.
+# Unknown emails are verified against it so they take as long to reject as a wrong
+# password for a real account.
+DUMMY_PASSWORD_HASH = _argon2.hash(secrets.token_urlsafe())
+
+# Hashing is CPU-bound, so it runs on a bounded pool instead of the event loop
+_PWD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pwd-hash")
 
 # Security scheme
 security = HTTPBearer()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# Validated tokens, keyed by token hash: {key: (expires_at, TokenData)}
+TOKEN_CACHE_TTL = 300  # seconds, further bounded by the token's own exp
+TOKEN_CACHE_MAXSIZE = 10_000
+_token_cache: Dict[str, Tuple[float, TokenData]] = {}
+# Logged-out tokens, keyed by token hash: {key: token exp}
+_revoked_tokens: Dict[str, float] = {}
+
+def _token_key(token: str) -> str:
+    """Hash a token for use as a cache key."""
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against an Argon2id or legacy bcrypt hash."""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _argon2.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        return False
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PWD_POOL, _check_password, plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PWD_POOL, _argon2.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create a JWT access token."""
-    to_encode = data.copy()
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    """Create a JWT access token (HS256, signed without a generic JWT library round-trip)."""
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {**data, "exp": int(time.time() + expires_delta.total_seconds())}
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    signing_input = _HEADER_SEGMENT + b"." + base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=")
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")).decode()
 
 def verify_token(token: str) -> TokenData:
     """Verify and decode a JWT token."""
+    return _decode_token(token)[0]
+
+def _decode_token(token: str) -> Tuple[TokenData, float]:
+    """Verify a JWT token and return its data and expiry timestamp."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -63,7 +115,7 @@ def verify_token(token: str) -> TokenData:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        return TokenData(user_id=user_id, email=email, role=UserRole(role))
+        return TokenData(user_id=user_id, email=email, role=UserRole(role)), float(payload.get("exp", 0))
     
     except JWTError:
         raise HTTPException(
@@ -72,10 +124,46 @@ def verify_token(token: str) -> TokenData:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+def revoke_token(token: str):
+    """Reject a token from now on (used on logout)."""
+    key = _token_key(token)
+    _token_cache.pop(key, None)
+    try:
+        _, exp = _decode_token(token)
+    except HTTPException:
+        return
+    now = time.time()
+    # Forget revocations whose tokens have expired anyway
+    for expired in [k for k, until in _revoked_tokens.items() if until <= now]:
+        del _revoked_tokens[expired]
+    _revoked_tokens[key] = exp
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
     """Get current authenticated user from token."""
     token = credentials.credentials
-    return verify_token(token)
+    key = _token_key(token)
+    now = time.time()
+    
+    if key in _revoked_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    cached = _token_cache.get(key)
+    if cached is not None:
+        if cached[0] > now:
+            return cached[1]
+        del _token_cache[key]
+    
+    token_data, exp = _decode_token(token)
+    
+    if len(_token_cache) >= TOKEN_CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _token_cache[next(iter(_token_cache))]
+    _token_cache[key] = (min(exp, now + TOKEN_CACHE_TTL), token_data)
+    return token_data
 
 async def get_current_hr_user(current_user: TokenData = Depends(get_current_user)) -> TokenData:
     """Get current HR user (role-based access)."""
@@ -0,0 +1,121 @@
+"""
+Query result cache for the Firebase adapter.
+Uses Redis when REDIS_URL is configured, otherwise an in-process TTL cache.
+"""
+
+import os
+import copy
+import pickle
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+import orjson
+from cachetools import TTLCache
+
+# Optional import for a shared cache across workers
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "60"))  # seconds
+# Entries kept per collection by the in-process cache; the least recently used go first
+QUERY_CACHE_MAXSIZE = int(os.getenv("QUERY_CACHE_MAXSIZE", "1024"))
+
+# Sentinel for "not cached", since None is a valid cached find_one result
+MISS = object()
+
+class QueryCache:
+    """Read-through cache keyed on (collection, query hash)."""
+
+    def __init__(self, ttl: int = QUERY_CACHE_TTL, maxsize: int = QUERY_CACHE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.redis = None
+        # One bounded cache per collection, so invalidating a collection drops its
+        # cache without scanning the others
+        self._local: Dict[str, TTLCache] = {}
+
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and REDIS_AVAILABLE:
+            self.redis = aioredis.from_url(redis_url)
+
+    @staticmethod
+    def make_key(collection_name: str, operation: str, query: Optional[Dict[str, Any]]) -> str:
+        """Build a cache key for a query on a collection."""
+        encoded = orjson.dumps(query or {}, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        return f"{collection_name}:{operation}:{digest}"
+
+    @staticmethod
+    def _collection(key: str) -> str:
+        """Collection name a cache key was built for."""
+        return key.partition(":")[0]
+
+    @staticmethod
+    def _index_key(collection_name: str) -> str:
+        """Redis set holding the cache keys stored for a collection."""
+        return f"query_cache_index:{collection_name}"
+
+    async def get(self, key: str) -> Any:
+        """Return the cached value for key, or MISS."""
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(key)
+                return MISS if raw is None else pickle.loads(raw)
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+                return MISS
+
+        cache = self._local.get(self._collection(key))
+        value = MISS if cache is None else cache.get(key, MISS)
+        if value is MISS:
+            return MISS
+        # Callers mutate returned documents, so never hand out the cached object
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any):
+        """Cache value under key for the configured TTL."""
+        if self.ttl <= 0:
+            return
+        if self.redis is not None:
+            # Register the key in its collection's index, which outlives every key in it
+            index_key = self._index_key(self._collection(key))
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, self.ttl, pickle.dumps(value))
+                    pipe.sadd(index_key, key)
+                    pipe.expire(index_key, self.ttl)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+            return
+        cache = self._local.get(self._collection(key))
+        if cache is None:
+            cache = self._local[self._collection(key)] = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        cache[key] = copy.deepcopy(value)
+
+    async def invalidate(self, collection_name: str):
+        """Drop every cached entry for a collection."""
+        if self.redis is not None:
+            index_key = self._index_key(collection_name)
+            try:
+                # Take the index atomically; keys cached after this start a new index
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.smembers(index_key)
+                    pipe.delete(index_key)
+                    keys, _ = await pipe.execute()
+                if keys:
+                    await self.redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Redis cache invalidation failed: {e}")
+            return
+        self._local.pop(collection_name, None)
+
+# Global query cache instance
+query_cache = QueryCache()
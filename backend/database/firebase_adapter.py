@@ -3,28 +3,246 @@ Firebase adapter to provide MongoDB-like interface.
 This makes the transition from MongoDB to Firebase easier.
 """
 
-from typing import Dict, List, Any, Optional
-import uuid
-from database.firebase_connection import get_firebase_connection
+from functools import lru_cache
+from typing import ClassVar, Dict, Iterable, List, Any, Optional, Tuple
+import asyncio
+import logging
+import re
+from ulid import ULID
+from google.cloud.firestore import Increment
+from google.api_core.exceptions import AlreadyExists, NotFound
+from database.firebase_connection import FirebaseConnection, FIRESTORE_TIMEOUT
+from database.cache import query_cache, MISS
+
+logger = logging.getLogger(__name__)
+
+def new_document_id() -> str:
+    """
+    Generate a time-sortable document ID (ULID).
+    
+    IDs sort lexically by creation time, so recency queries can order by
+    document ID (q.order_by('__name__').start_after(last_id).limit(n))
+    instead of needing a created_at index. Existing UUID4 IDs stay valid.
+    """
+    return str(ULID())
+
+# MongoDB comparison operators and their Firestore equivalents
+FIRESTORE_OPERATORS = {
+    "$eq": "==",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+    "$in": "in",
+    "$nin": "not-in",
+}
+
+# Operators Firestore treats as range/inequality filters
+RANGE_OPERATORS = {"!=", ">", ">=", "<", "<=", "not-in"}
+
+# Firestore caps the number of values in a single 'in' filter
+IN_QUERY_LIMIT = 30
+
+# 'in' queries a single find_in keeps in flight at once
+IN_QUERY_CONCURRENCY = 8
+
+# MongoDB sort directions and their Firestore equivalents
+SORT_DIRECTIONS = {1: "ASCENDING", -1: "DESCENDING"}
+
+def _split_filters(query: Optional[Dict[str, Any]]) -> Tuple[List[tuple], Dict[str, Any]]:
+    """
+    Split a MongoDB-style query into Firestore filters and a residual query.
+    
+    Firestore allows inequality filters on a single field per query, and has no
+    equivalent for $regex or $or, so those predicates are returned as a residual
+    query that is evaluated client-side over the already-narrowed result set.
+    """
+    filters = []
+    residual = {}
+    range_field = None
+    
+    for field, value in (query or {}).items():
+        if field.startswith("$"):
+            residual[field] = value
+            continue
+        
+        if isinstance(value, tuple):
+            conditions = [value]
+        elif isinstance(value, dict) and value and all(k in FIRESTORE_OPERATORS for k in value):
+            conditions = [(FIRESTORE_OPERATORS[k], v) for k, v in value.items()]
+        elif isinstance(value, dict):
+            residual[field] = value
+            continue
+        else:
+            conditions = [("==", value)]
+        
+        for op, operand in conditions:
+            if op in RANGE_OPERATORS:
+                if range_field not in (None, field):
+                    residual.setdefault(field, {})
+                    residual[field][_mongo_operator(op)] = operand
+                    continue
+                range_field = field
+            filters.append((field, op, operand))
+    
+    return filters, residual
+
+def _mongo_operator(op: str) -> str:
+    """Map a Firestore operator back to its MongoDB spelling."""
+    for mongo_op, firestore_op in FIRESTORE_OPERATORS.items():
+        if firestore_op == op:
+            return mongo_op
+    return op
+
+def _matches_condition(value: Any, op: str, operand: Any) -> bool:
+    """Evaluate a single MongoDB operator against a document value."""
+    if op == "$regex":
+        return isinstance(value, str) and re.search(operand, value) is not None
+    if op == "$in":
+        if isinstance(value, list):
+            return any(v in operand for v in value)
+        return value in operand
+    if op == "$nin":
+        return not _matches_condition(value, "$in", operand)
+    if op == "array_contains":
+        return isinstance(value, list) and operand in value
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(v in value for v in operand)
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    return False
+
+def _compile_regex(conditions: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace a $regex/$options pair with a compiled pattern."""
+    conditions = dict(conditions)
+    flags = re.IGNORECASE if "i" in conditions.pop("$options", "") else 0
+    conditions["$regex"] = re.compile(conditions["$regex"], flags)
+    return conditions
+
+def _compile_residual(query: Dict[str, Any]) -> Dict[str, Any]:
+    """Compile every regex in a residual query once, before it is run per document."""
+    compiled = {}
+    for field, expected in query.items():
+        if field in ("$or", "$and"):
+            compiled[field] = [_compile_residual(clause) for clause in expected]
+        elif isinstance(expected, dict) and isinstance(expected.get("$regex"), str):
+            compiled[field] = _compile_regex(expected)
+        else:
+            compiled[field] = expected
+    return compiled
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate a residual MongoDB-style query against a document."""
+    for field, expected in query.items():
+        if field == "$or":
+            if not any(_matches(doc, clause) for clause in expected):
+                return False
+            continue
+        if field == "$and":
+            if not all(_matches(doc, clause) for clause in expected):
+                return False
+            continue
+        
+        value = doc.get(field)
+        if isinstance(expected, dict):
+            conditions = expected
+            if isinstance(conditions.get("$regex"), str):
+                conditions = _compile_regex(conditions)
+            if not all(_matches_condition(value, op, operand) for op, operand in conditions.items()):
+                return False
+        elif isinstance(expected, tuple):
+            if not _matches_condition(value, _mongo_operator(expected[0]), expected[1]):
+                return False
+        elif value != expected:
+            return False
+    return True
+
+def _projection_fields(projection: Any) -> Optional[List[str]]:
+    """Normalize a MongoDB-style projection (dict or list) to Firestore field paths."""
+    if not projection:
+        return None
+    if isinstance(projection, dict):
+        return [field for field, include in projection.items() if include and field != "_id"]
+    return [field for field in projection if field != "_id"]
+
+def _update_fields(update: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate a MongoDB update document ($set/$inc) into Firestore update data."""
+    if not any(key.startswith("$") for key in update):
+        return update
+    data = dict(update.get("$set", {}))
+    # Increments are applied server-side, so concurrent updates are not lost
+    for field, amount in update.get("$inc", {}).items():
+        data[field] = Increment(amount)
+    return data
+
+def _apply_update(doc: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of doc with a MongoDB update document applied locally."""
+    if not any(key.startswith("$") for key in update):
+        return {**doc, **update}
+    doc = {**doc, **update.get("$set", {})}
+    for field, amount in update.get("$inc", {}).items():
+        doc[field] = (doc.get(field) or 0) + amount
+    return doc
+
+class DuplicateKeyError(Exception):
+    """Raised when inserting a document whose _id already exists (pymongo compatible)."""
+
+class ReturnDocument:
+    """Which version of the document find_one_and_update returns (pymongo compatible)."""
+    BEFORE = False
+    AFTER = True
+
+class FirebaseResultList(list):
+    """List of documents that also carries the Firestore cursor of the page."""
+    
+    def __init__(self, docs=(), last_snapshot=None):
+        super().__init__(docs)
+        self.last_snapshot = last_snapshot
 
 class FirebaseQuery:
     """Firebase query object that mimics MongoDB cursor."""
     
-    def __init__(self, collection_name: str, query: Dict[str, Any] = None):
+    # Bound once at startup by the application lifespan
+    _firebase: ClassVar[Optional[FirebaseConnection]] = None
+    
+    def __init__(self, collection_name: str, query: Dict[str, Any] = None, projection: Any = None):
         self.collection_name = collection_name
         self.query = query
-        self.firebase = None
+        self.projection = _projection_fields(projection)
         self.skip_count = 0
         self.limit_count = None
+        self.last_snapshot = None
+        self._order = []
     
-    async def _get_firebase(self):
+    def _get_firebase(self) -> FirebaseConnection:
         """Get Firebase connection."""
-        if not self.firebase:
-            self.firebase = await get_firebase_connection()
-        return self.firebase
+        if self._firebase is None:
+            raise Exception("Firebase not initialized. Call get_firebase_connection() first.")
+        return self._firebase
     
     def skip(self, count: int):
-        """Skip documents (for pagination)."""
+        """Skip documents (compatibility shim, prefer start_after)."""
+        if count:
+            logger.warning(
+                "Offset pagination on '%s' is billed per skipped document; use start_after() instead",
+                self.collection_name
+            )
         self.skip_count = count
         return self
     
@@ -33,112 +251,379 @@ class FirebaseQuery:
         self.limit_count = count
         return self
     
+    def sort(self, key_or_list, direction: Any = "ASCENDING"):
+        """
+        Order results server-side, MongoDB style.
+        
+        Accepts a field name and direction (1/-1 or "ASCENDING"/"DESCENDING"),
+        or a list of (field, direction) pairs. Sorting on a field other than
+        an equality filter needs a composite index (see firestore.indexes.json
+        in the README).
+        """
+        keys = key_or_list if isinstance(key_or_list, list) else [(key_or_list, direction)]
+        self._order = [(field, SORT_DIRECTIONS.get(d, d)) for field, d in keys]
+        return self
+    
+    def start_after(self, snapshot):
+        """
+        Resume after a document snapshot returned by a previous page, or after a
+        list of values for the sort fields (keyset pagination across requests).
+        """
+        self.last_snapshot = snapshot
+        return self
+    
+    def _build_query(self):
+        """Translate the filters and sort order into a Firestore query."""
+        firebase = self._get_firebase()
+        query = firebase.get_collection(self.collection_name)
+        
+        # Convert MongoDB query to a single compound Firestore query
+        filters, residual = _split_filters(self.query)
+        for field, op, value in filters:
+            query = query.where(field, op, value)
+        
+        if self._order:
+            # Firestore rejects an order_by whose first field is not the range field
+            range_fields = {field for field, op, _ in filters if op in RANGE_OPERATORS}
+            if range_fields and self._order[0][0] not in range_fields:
+                raise ValueError(
+                    f"First sort field on '{self.collection_name}' must be the range-filtered field "
+                    f"{sorted(range_fields)[0]!r}, got {self._order[0][0]!r}"
+                )
+            for field, direction in self._order:
+                query = query.order_by(field, direction=direction)
+        return query, _compile_residual(residual)
+    
+    async def __aiter__(self):
+        """Stream matching documents one at a time instead of building a list."""
+        query, residual = self._build_query()
+        if not residual and self.projection:
+            query = query.select(self.projection)
+        if self.last_snapshot is not None:
+            query = query.start_after(self.last_snapshot)
+        elif self.skip_count and not residual:
+            query = query.offset(self.skip_count)
+        if self.limit_count is not None and not residual:
+            query = query.limit(self.limit_count)
+        
+        yielded = skipped = 0
+        async for doc in query.stream(timeout=FIRESTORE_TIMEOUT):
+            doc_data = doc.to_dict()
+            doc_data["_id"] = doc.id  # Add document ID as _id for compatibility
+            if residual:
+                if not _matches(doc_data, residual):
+                    continue
+                if self.last_snapshot is None and skipped < self.skip_count:
+                    skipped += 1
+                    continue
+                if self.limit_count is not None and yielded >= self.limit_count:
+                    break
+            yielded += 1
+            yield doc_data
+    
     async def to_list(self, length: int = None) -> List[Dict[str, Any]]:
         """Convert query to list of documents."""
-        firebase = await self._get_firebase()
-        collection = firebase.get_collection(self.collection_name)
+        query, residual = self._build_query()
         
-        if self.query:
-            # Convert MongoDB query to Firestore query
-            docs = collection.where(list(self.query.keys())[0], "==", list(self.query.values())[0]).stream()
-        else:
-            docs = collection.stream()
+        limits = [n for n in (self.limit_count, length) if n is not None]
+        limit = min(limits) if limits else None
         
-        result = []
-        count = 0
-        skipped = 0
+        if residual:
+            # Pagination has to follow the client-side reduction, which also
+            # needs the full documents, so no projection is applied here
+            return await self._paginate_residual(query, residual, limit)
         
-        for doc in docs:
-            # Apply skip
-            if skipped < self.skip_count:
-                skipped += 1
-                continue
-                
-            # Apply limit
-            if self.limit_count is not None and count >= self.limit_count:
-                break
-            if length is not None and count >= length:
+        if self.projection:
+            # Only ship the requested fields over the wire
+            query = query.select(self.projection)
+        
+        # Push pagination down into Firestore so only the requested page is read
+        if self.last_snapshot is not None:
+            query = query.start_after(self.last_snapshot)
+        elif self.skip_count:
+            query = query.offset(self.skip_count)
+        
+        if limit is not None:
+            query = query.limit(limit)
+        
+        result = FirebaseResultList()
+        async for doc in query.stream(timeout=FIRESTORE_TIMEOUT):
+            doc_data = doc.to_dict()
+            doc_data["_id"] = doc.id  # Add document ID as _id for compatibility
+            result.append(doc_data)
+            result.last_snapshot = doc
+        return result
+    
+    async def _paginate_residual(self, query, residual: Dict[str, Any], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Apply the residual query, skip and limit over the index-narrowed stream."""
+        if self.last_snapshot is not None:
+            query = query.start_after(self.last_snapshot)
+        
+        result = FirebaseResultList()
+        skipped = 0
+        async for doc in query.stream(timeout=FIRESTORE_TIMEOUT):
+            if limit is not None and len(result) >= limit:
                 break
-                
             doc_data = doc.to_dict()
             doc_data["_id"] = doc.id  # Add document ID as _id for compatibility
+            if not _matches(doc_data, residual):
+                continue
+            if self.last_snapshot is None and skipped < self.skip_count:
+                skipped += 1
+                continue
             result.append(doc_data)
-            count += 1
+            result.last_snapshot = doc
         return result
 
 class FirebaseCollection:
     """Firebase collection adapter that mimics MongoDB collection interface."""
     
+    # Bound once at startup by the application lifespan
+    _firebase: ClassVar[Optional[FirebaseConnection]] = None
+    
     def __init__(self, collection_name: str):
         self.collection_name = collection_name
-        self.firebase = None
     
-    async def _get_firebase(self):
+    def _get_firebase(self) -> FirebaseConnection:
         """Get Firebase connection."""
-        if not self.firebase:
-            self.firebase = await get_firebase_connection()
-        return self.firebase
+        if self._firebase is None:
+            raise Exception("Firebase not initialized. Call get_firebase_connection() first.")
+        return self._firebase
     
-    async def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Find one document matching the query."""
-        firebase = await self._get_firebase()
-        collection = firebase.get_collection(self.collection_name)
+    async def find_one(
+        self,
+        query: Dict[str, Any],
+        projection: Any = None,
+        sort: Optional[List[tuple]] = None,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find one document matching the query, optionally the first by sort order.
         
-        # Convert MongoDB query to Firestore query
-        docs = collection.where(list(query.keys())[0], "==", list(query.values())[0]).limit(1).stream()
+        Pass use_cache=False for reads that must see the stored document, such as
+        the lookups writes act on and credential checks; the cache may be stale
+        when another worker has written since.
+        """
+        if use_cache:
+            cache_query = {"query": query, "projection": projection, "sort": sort} if projection or sort else query
+            key = query_cache.make_key(self.collection_name, "find_one", cache_query)
+            cached = await query_cache.get(key)
+            if cached is not MISS:
+                return cached
         
-        for doc in docs:
-            doc_data = doc.to_dict()
-            doc_data["_id"] = doc.id  # Add document ID as _id for compatibility
-            return doc_data
-        return None
+        cursor = self.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        docs = await cursor.limit(1).to_list()
+        doc = docs[0] if docs else None
+        if use_cache:
+            await query_cache.set(key, doc)
+        return doc
     
-    def find(self, query: Dict[str, Any] = None):
-        """Find documents matching the query."""
+    def find(self, query: Dict[str, Any] = None, projection: Any = None):
+        """Find documents matching the query, optionally projecting fields."""
         # Return a FirebaseQuery object that mimics MongoDB cursor
-        return FirebaseQuery(self.collection_name, query)
+        return FirebaseQuery(self.collection_name, query, projection)
     
     async def insert_one(self, document: Dict[str, Any]) -> Dict[str, Any]:
-        """Insert one document."""
-        firebase = await self._get_firebase()
-        doc_id = document.get("_id", str(uuid.uuid4()))
-        await firebase.create_document(self.collection_name, doc_id, document)
+        """Insert one document; raises DuplicateKeyError if its _id is taken."""
+        firebase = self._get_firebase()
+        doc_id = document.get("_id") or new_document_id()
+        try:
+            await firebase.create_document(self.collection_name, doc_id, document, overwrite=False)
+        except AlreadyExists as e:
+            raise DuplicateKeyError(f"{self.collection_name}/{doc_id} already exists") from e
+        await query_cache.invalidate(self.collection_name)
         return {"inserted_id": doc_id}
     
+    async def replace_one(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or overwrite one document by its _id (like replace_one with upsert=True)."""
+        firebase = self._get_firebase()
+        await firebase.create_document(self.collection_name, document["_id"], document)
+        await query_cache.invalidate(self.collection_name)
+        return {"upserted_id": document["_id"]}
+    
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert many documents using batched writes."""
+        firebase = self._get_firebase()
+        items = [(document.get("_id") or new_document_id(), document) for document in documents]
+        if items:
+            await firebase.bulk_set(self.collection_name, items)
+            await query_cache.invalidate(self.collection_name)
+        return {"inserted_ids": [doc_id for doc_id, _ in items]}
+    
     async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
         """Update one document."""
-        firebase = await self._get_firebase()
+        firebase = self._get_firebase()
         
         # Find the document first
-        doc = await self.find_one(query)
+        doc = await self.find_one(query, use_cache=False)
         if doc:
             doc_id = doc.get("_id")
             if doc_id:
-                # Update the document
-                await firebase.update_document(self.collection_name, doc_id, update.get("$set", update))
+                # Update the document; it may have been deleted since it was read
+                try:
+                    await firebase.update_document(self.collection_name, doc_id, _update_fields(update))
+                except NotFound:
+                    return {"matched_count": 0, "modified_count": 0}
+                await query_cache.invalidate(self.collection_name)
                 return {"matched_count": 1, "modified_count": 1}
         
         return {"matched_count": 0, "modified_count": 0}
     
+    async def find_one_and_update(
+        self,
+        query: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Any = None,
+        return_document: bool = ReturnDocument.BEFORE
+    ) -> Optional[Dict[str, Any]]:
+        """Update one document and return it without a second read."""
+        doc = await self.find_one(query, use_cache=False)
+        if not doc:
+            return None
+        
+        firebase = self._get_firebase()
+        try:
+            await firebase.update_document(self.collection_name, doc["_id"], _update_fields(update))
+        except NotFound:
+            # Deleted since it was read
+            return None
+        await query_cache.invalidate(self.collection_name)
+        
+        if return_document:
+            # Apply the write locally instead of re-reading the document
+            doc = _apply_update(doc, update)
+        fields = _projection_fields(projection)
+        if fields:
+            doc = {field: doc[field] for field in ["_id", *fields] if field in doc}
+        return doc
+    
+    async def update_many(self, query: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        """Update every document matching the query using batched writes."""
+        firebase = self._get_firebase()
+        docs = await self.find(query).to_list()
+        data = _update_fields(update)
+        items = [(doc["_id"], data) for doc in docs]
+        if items:
+            await firebase.bulk_update(self.collection_name, items)
+            await query_cache.invalidate(self.collection_name)
+        return {"matched_count": len(items), "modified_count": len(items)}
+    
+    async def bulk_update(self, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Apply (document_id, fields) updates in batched writes (like an unordered bulk_write)."""
+        if items:
+            firebase = self._get_firebase()
+            await firebase.bulk_update(self.collection_name, items)
+            await query_cache.invalidate(self.collection_name)
+        return {"matched_count": len(items), "modified_count": len(items)}
+    
+    async def bulk_increment(self, field: str, amounts: Dict[str, int]) -> Dict[str, Any]:
+        """Add per-document amounts to a counter field using server-side increments."""
+        items = [(doc_id, {field: Increment(amount)}) for doc_id, amount in amounts.items() if amount]
+        updated = 0
+        if items:
+            # Documents deleted since the amounts were collected are skipped, not fatal
+            firebase = self._get_firebase()
+            updated = await firebase.bulk_update_existing(self.collection_name, items)
+            await query_cache.invalidate(self.collection_name)
+        return {"matched_count": updated, "modified_count": updated}
+    
     async def delete_one(self, query: Dict[str, Any]) -> Dict[str, Any]:
         """Delete one document."""
-        firebase = await self._get_firebase()
+        firebase = self._get_firebase()
         
         # Find the document first
-        doc = await self.find_one(query)
+        doc = await self.find_one(query, use_cache=False)
         if doc:
             doc_id = doc.get("_id")
             if doc_id:
                 await firebase.delete_document(self.collection_name, doc_id)
+                await query_cache.invalidate(self.collection_name)
                 return {"deleted_count": 1}
         
         return {"deleted_count": 0}
     
+    async def delete_many(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Delete every document matching the query using batched writes."""
+        firebase = self._get_firebase()
+        docs = await self.find(query).to_list()
+        doc_ids = [doc["_id"] for doc in docs]
+        if doc_ids:
+            await firebase.bulk_delete(self.collection_name, doc_ids)
+            await query_cache.invalidate(self.collection_name)
+        return {"deleted_count": len(doc_ids)}
+    
+    async def find_in(
+        self,
+        field: str,
+        values: Iterable[Any],
+        query: Dict[str, Any] = None,
+        projection: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch every document whose `field` is one of `values` (a batched join).
+        
+        Replaces one find_one per value with ceil(n / IN_QUERY_LIMIT) 'in'
+        queries, at most IN_QUERY_CONCURRENCY of them running at once.
+        """
+        values = list(dict.fromkeys(values))
+        if not values:
+            return []
+        fields = _projection_fields(projection)
+        if fields is not None and field not in fields:
+            fields = [*fields, field]
+        chunks = [values[i:i + IN_QUERY_LIMIT] for i in range(0, len(values), IN_QUERY_LIMIT)]
+        semaphore = asyncio.Semaphore(IN_QUERY_CONCURRENCY)
+        
+        async def fetch(chunk: List[Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.find({**(query or {}), field: {"$in": chunk}}, fields).to_list()
+        
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return [doc for docs in results for doc in docs]
+    
+    async def find_latest_in(
+        self,
+        field: str,
+        values: Iterable[Any],
+        sort_field: str = "created_at",
+        query: Dict[str, Any] = None,
+        projection: Any = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Map each of `values` to its most recent matching document by `sort_field`."""
+        fields = _projection_fields(projection)
+        if fields is not None and sort_field not in fields:
+            fields = [*fields, sort_field]
+        latest: Dict[Any, Dict[str, Any]] = {}
+        for doc in await self.find_in(field, values, query, fields):
+            key = doc.get(field)
+            current = latest.get(key)
+            stamp = doc.get(sort_field)
+            if current is None or (
+                stamp is not None and (current.get(sort_field) is None or stamp > current[sort_field])
+            ):
+                latest[key] = doc
+        return latest
+    
     async def count_documents(self, query: Dict[str, Any] = None) -> int:
         """Count documents matching the query."""
-        docs = await self.find(query)
-        return len(docs)
+        key = query_cache.make_key(self.collection_name, "count", query)
+        cached = await query_cache.get(key)
+        if cached is not MISS:
+            return cached
+        
+        filters, residual = _split_filters(query)
+        if residual:
+            # Predicates Firestore cannot evaluate still need the documents
+            count = len(await self.find(query).to_list())
+        else:
+            firebase = self._get_firebase()
+            count = await firebase.count(self.collection_name, filters)
+        await query_cache.set(key, count)
+        return count
 
+@lru_cache(maxsize=None)
 def get_collection(collection_name: str) -> FirebaseCollection:
-    """Get a Firebase collection adapter."""
+    """Get a Firebase collection adapter (one shared instance per collection)."""
     return FirebaseCollection(collection_name)
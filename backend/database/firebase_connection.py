@@ -5,11 +5,39 @@ Handles Firestore database connections and operations.
 
 import os
 import json
+import functools
+import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import firebase_admin
-from firebase_admin import credentials, firestore
-from google.cloud import firestore as firestore_client
+from firebase_admin import credentials, firestore_async
+from google.api_core.exceptions import NotFound
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of operations Firestore accepts in a single batch commit
+BATCH_SIZE = 500
+
+# Deadline in seconds for each Firestore RPC, so an unreachable backend fails
+# the request instead of stalling its handler indefinitely
+FIRESTORE_TIMEOUT = float(os.getenv("FIRESTORE_TIMEOUT", "10"))
+
+@functools.cache
+def _build_credentials():
+    """Resolve Firebase credentials once per process."""
+    cred_path = os.getenv('FIREBASE_CREDENTIALS_PATH', './firebase-service-account.json')
+    
+    if os.path.exists(cred_path):
+        # Use service account file
+        logger.info("Using Firebase credentials from: %s", cred_path)
+        return credentials.Certificate(cred_path)
+    if os.getenv('FIREBASE_CREDENTIALS_JSON'):
+        # Use JSON credentials from environment variable
+        cred_dict = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
+        return credentials.Certificate(cred_dict)
+    # Use default credentials (for local development)
+    logger.info("Using default Firebase credentials")
+    return credentials.ApplicationDefault()
 
 class FirebaseConnection:
     """Firebase Firestore connection manager."""
@@ -17,6 +45,7 @@ class FirebaseConnection:
     def __init__(self):
         self.db = None
         self.initialized = False
+        self._collections = {}
     
     async def initialize(self):
         """Initialize Firebase connection."""
@@ -26,50 +55,43 @@ class FirebaseConnection:
         try:
             # Check if Firebase is already initialized
             if not firebase_admin._apps:
-                # Initialize Firebase Admin SDK
-                cred_path = os.getenv('FIREBASE_CREDENTIALS_PATH', './firebase-service-account.json')
-                
-                if os.path.exists(cred_path):
-                    # Use service account file
-                    print(f"Using Firebase credentials from: {cred_path}")
-                    cred = credentials.Certificate(cred_path)
-                elif os.getenv('FIREBASE_CREDENTIALS_JSON'):
-                    # Use JSON credentials from environment variable
-                    cred_dict = json.loads(os.getenv('FIREBASE_CREDENTIALS_JSON'))
-                    cred = credentials.Certificate(cred_dict)
-                else:
-                    # Use default credentials (for local development)
-                    print("Using default Firebase credentials")
-                    cred = credentials.ApplicationDefault()
-                
-                firebase_admin.initialize_app(cred)
+                firebase_admin.initialize_app(_build_credentials())
             
-            # Get Firestore client
-            self.db = firestore.client()
+            # Get the native asyncio Firestore client (gRPC aio, no thread hops)
+            self.db = firestore_async.client()
             self.initialized = True
-            print("✅ Connected to Firebase Firestore")
+            logger.info("Connected to Firebase Firestore")
             
         except Exception as e:
-            print(f"❌ Error connecting to Firebase: {e}")
+            logger.error("Error connecting to Firebase: %s", e)
             raise e
     
     def get_collection(self, collection_name: str):
         """Get a Firestore collection reference."""
         if not self.initialized:
             raise Exception("Firebase not initialized")
-        return self.db.collection(collection_name)
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            # References are bound to the shared client, so build each one once
+            collection = self._collections[collection_name] = self.db.collection(collection_name)
+        return collection
     
-    async def create_document(self, collection_name: str, document_id: str, data: Dict[str, Any]) -> str:
-        """Create a document in Firestore."""
+    async def create_document(
+        self, collection_name: str, document_id: str, data: Dict[str, Any], overwrite: bool = True
+    ) -> str:
+        """Create a document in Firestore (raises AlreadyExists if overwrite is False and it exists)."""
         collection = self.get_collection(collection_name)
         doc_ref = collection.document(document_id)
-        doc_ref.set(data)
+        if overwrite:
+            await doc_ref.set(data, timeout=FIRESTORE_TIMEOUT)
+        else:
+            await doc_ref.create(data, timeout=FIRESTORE_TIMEOUT)
         return document_id
     
     async def get_document(self, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
         """Get a document from Firestore."""
         collection = self.get_collection(collection_name)
-        doc = collection.document(document_id).get()
+        doc = await collection.document(document_id).get(timeout=FIRESTORE_TIMEOUT)
         if doc.exists:
             return doc.to_dict()
         return None
@@ -78,18 +100,81 @@ class FirebaseConnection:
         """Update a document in Firestore."""
         collection = self.get_collection(collection_name)
         doc_ref = collection.document(document_id)
-        doc_ref.update(data)
+        await doc_ref.update(data, timeout=FIRESTORE_TIMEOUT)
         return True
     
     async def delete_document(self, collection_name: str, document_id: str) -> bool:
         """Delete a document from Firestore."""
         collection = self.get_collection(collection_name)
         doc_ref = collection.document(document_id)
-        doc_ref.delete()
+        await doc_ref.delete(timeout=FIRESTORE_TIMEOUT)
         return True
     
-    async def query_collection(self, collection_name: str, filters: List[tuple] = None, limit: int = None) -> List[Dict[str, Any]]:
-        """Query a collection with optional filters."""
+    async def _commit_in_batches(self, operations: List[tuple]):
+        """Commit (method, doc_ref, data) operations in batches of BATCH_SIZE."""
+        for start in range(0, len(operations), BATCH_SIZE):
+            batch = self.db.batch()
+            for method, doc_ref, data in operations[start:start + BATCH_SIZE]:
+                if method == "delete":
+                    batch.delete(doc_ref)
+                else:
+                    getattr(batch, method)(doc_ref, data)
+            await batch.commit(timeout=FIRESTORE_TIMEOUT)
+    
+    async def bulk_set(self, collection_name: str, items: List[tuple]) -> int:
+        """Create or overwrite (document_id, data) pairs using batched writes."""
+        collection = self.get_collection(collection_name)
+        await self._commit_in_batches([
+            ("set", collection.document(document_id), data) for document_id, data in items
+        ])
+        return len(items)
+    
+    async def bulk_update(self, collection_name: str, items: List[tuple]) -> int:
+        """Update (document_id, data) pairs using batched writes."""
+        collection = self.get_collection(collection_name)
+        await self._commit_in_batches([
+            ("update", collection.document(document_id), data) for document_id, data in items
+        ])
+        return len(items)
+    
+    async def bulk_update_existing(self, collection_name: str, items: List[tuple]) -> int:
+        """Update (document_id, data) pairs in batches, skipping documents that no longer exist."""
+        collection = self.get_collection(collection_name)
+        updated = 0
+        for start in range(0, len(items), BATCH_SIZE):
+            chunk = items[start:start + BATCH_SIZE]
+            batch = self.db.batch()
+            for document_id, data in chunk:
+                batch.update(collection.document(document_id), data)
+            try:
+                await batch.commit(timeout=FIRESTORE_TIMEOUT)
+                updated += len(chunk)
+            except NotFound:
+                # One missing document fails the whole batch, so write this one document by document
+                for document_id, data in chunk:
+                    try:
+                        await collection.document(document_id).update(data, timeout=FIRESTORE_TIMEOUT)
+                        updated += 1
+                    except NotFound:
+                        pass
+        return updated
+    
+    async def bulk_delete(self, collection_name: str, document_ids: List[str]) -> int:
+        """Delete documents by ID using batched writes."""
+        collection = self.get_collection(collection_name)
+        await self._commit_in_batches([
+            ("delete", collection.document(document_id), None) for document_id in document_ids
+        ])
+        return len(document_ids)
+    
+    async def query_collection(
+        self,
+        collection_name: str,
+        filters: List[tuple] = None,
+        limit: int = None,
+        projection: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Query a collection with optional filters and field projection."""
         collection = self.get_collection(collection_name)
         query = collection
         
@@ -97,11 +182,24 @@ class FirebaseConnection:
             for field, operator, value in filters:
                 query = query.where(field, operator, value)
         
+        if projection:
+            query = query.select(projection)
+        
         if limit:
             query = query.limit(limit)
         
-        docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_dict() async for doc in query.stream(timeout=FIRESTORE_TIMEOUT)]
+    
+    async def count(self, collection_name: str, filters: List[tuple] = None) -> int:
+        """Count documents with a server-side COUNT aggregation."""
+        query = self.get_collection(collection_name)
+        
+        if filters:
+            for field, operator, value in filters:
+                query = query.where(field, operator, value)
+        
+        results = await query.count().get(timeout=FIRESTORE_TIMEOUT)
+        return int(results[0][0].value)
 
 # Global Firebase connection instance
 firebase_connection = FirebaseConnection()
@@ -5,12 +5,16 @@ This is the main entry point for the backend API server.
 
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 
 from database.firebase_connection import get_firebase_connection
+from database.firebase_adapter import FirebaseCollection, FirebaseQuery
 from routers import auth, jobs, resumes, candidates, skills, advanced_features
 from services.nlp_service import initialize_nlp_models
 from services.enhanced_nlp_service import initialize_enhanced_nlp
@@ -18,39 +22,57 @@ from services.enhanced_nlp_service import initialize_enhanced_nlp
 # Load environment variables
 load_dotenv()
 
+# Configure logging once for the whole application
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), force=True)
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     # Startup
-    print("🔥 Initializing core services...")
-    await get_firebase_connection()
-    print("✅ Firebase connection established")
+    logger.info("Initializing core services")
+    
+    # Firebase and the ML models are independent, so load them concurrently
+    logger.info("Loading ML models")
+    firebase, *model_results = await asyncio.gather(
+        get_firebase_connection(),
+        initialize_nlp_models(),
+        initialize_enhanced_nlp(),
+        return_exceptions=True
+    )
+    
+    if isinstance(firebase, Exception):
+        raise firebase
+    FirebaseCollection._firebase = firebase
+    FirebaseQuery._firebase = firebase
+    logger.info("Firebase connection established")
     
-    # Load ML models in background to avoid blocking startup
-    print("🤖 Loading ML models in background...")
-    try:
-        await initialize_nlp_models()
-        print("✅ NLP models loaded")
-    except Exception as e:
-        print(f"⚠️  NLP models loading failed: {e}")
+    for name, result in zip(("NLP", "Enhanced NLP"), model_results):
+        if isinstance(result, Exception):
+            logger.warning("%s models loading failed: %s", name, result)
+        else:
+            logger.info("%s models loaded", name)
     
-    try:
-        await initialize_enhanced_nlp()
-        print("✅ Enhanced NLP models loaded")
-    except Exception as e:
-        print(f"⚠️  Enhanced NLP models loading failed: {e}")
+    # Write buffered job views in the background
+    stop_view_flusher = asyncio.Event()
+    view_flusher = asyncio.create_task(jobs.run_view_flusher(stop_view_flusher))
     
-    print("🚀 Backend startup complete!")
+    logger.info("Backend startup complete")
     yield
     # Shutdown
+    # Stop the flusher, which writes the job views still buffered in memory
+    stop_view_flusher.set()
+    await view_flusher
     # Firebase doesn't need explicit connection closing
 
 app = FastAPI(
     title="Smart Resume Analyzer Platform",
     description="A comprehensive platform for HR and candidates to manage resumes, job postings, and skill analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes the dict-heavy payloads (reports, rankings, skill lists) much faster
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware configuration
@@ -60,6 +82,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paged list endpoints report the full result size in this header
+    expose_headers=["X-Total-Count"],
 )
 
 # Security scheme
@@ -9,10 +9,11 @@ from .user import (
 )
 from .job import (
     JobBase, JobCreate, JobUpdate, JobResponse, JobSearch,
-    JobApplication, JobApplicationResponse, JobType, ExperienceLevel, JobStatus
+    JobApplication, JobApplicationResponse, JobType, ExperienceLevel, JobStatus,
+    JobAnalytics, JobStatusUpdate, JobCompletionNotification, JobListItem
 )
 from .resume import (
-    ResumeBase, ResumeCreate, ResumeResponse, ParsedResumeData,
+    ResumeBase, ResumeCreate, ResumeResponse, ParsedResumeData, ParsedResumeSummary,
     ResumeAnalysis, CandidateRanking, SkillRecommendation,
     Education, Experience, Project, ResumeStatus
 )
@@ -25,9 +26,10 @@ __all__ = [
     # Job models
     "JobBase", "JobCreate", "JobUpdate", "JobResponse", "JobSearch",
     "JobApplication", "JobApplicationResponse", "JobType", "ExperienceLevel", "JobStatus",
+    "JobAnalytics", "JobStatusUpdate", "JobCompletionNotification", "JobListItem",
     
     # Resume models
-    "ResumeBase", "ResumeCreate", "ResumeResponse", "ParsedResumeData",
+    "ResumeBase", "ResumeCreate", "ResumeResponse", "ParsedResumeData", "ParsedResumeSummary",
     "ResumeAnalysis", "CandidateRanking", "SkillRecommendation",
     "Education", "Experience", "Project", "ResumeStatus"
 ]
@@ -0,0 +1,15 @@
+"""
+Shared model helpers for the Smart Resume Analyzer Platform.
+Field utilities used by more than one model module.
+"""
+
+from pydantic import BeforeValidator
+
+def enum_lookup(enum_cls) -> BeforeValidator:
+    """Resolve enum values with a single dict lookup before Pydantic validates."""
+    members = enum_cls._value2member_map_
+    
+    def lookup(value):
+        return members.get(value, value) if isinstance(value, str) else value
+    
+    return BeforeValidator(lookup)
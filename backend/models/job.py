@@ -3,10 +3,24 @@ Job models for the Smart Resume Analyzer Platform.
 Defines Pydantic models for job postings and related entities.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
+from typing import Annotated, Any, Dict, Optional, List
+from datetime import datetime, timezone
 from enum import Enum
+import re
+
+from .common import enum_lookup
+
+# Constrained string types, compiled once and shared by create/update models
+JobTitle = Annotated[str, StringConstraints(min_length=3, max_length=200)]
+JobDescription = Annotated[str, StringConstraints(min_length=50, max_length=5000)]
+CompanyName = Annotated[str, StringConstraints(min_length=2, max_length=100)]
+LocationName = Annotated[str, StringConstraints(min_length=2, max_length=100)]
+CoverLetter = Annotated[str, StringConstraints(max_length=2000)]
+
+def utc_now() -> datetime:
+    """Timezone-aware replacement for the deprecated datetime.utcnow."""
+    return datetime.now(timezone.utc)
 
 class JobType(str, Enum):
     """Job type enumeration."""
@@ -32,14 +46,19 @@ class JobStatus(str, Enum):
     COMPLETED = "completed"
     DRAFT = "draft"
 
+# Enum field types with the _value2member_map_ fast path
+JobTypeField = Annotated[JobType, enum_lookup(JobType)]
+ExperienceLevelField = Annotated[ExperienceLevel, enum_lookup(ExperienceLevel)]
+JobStatusField = Annotated[JobStatus, enum_lookup(JobStatus)]
+
 class JobBase(BaseModel):
     """Base job model with common fields."""
-    title: str = Field(..., min_length=3, max_length=200)
-    description: str = Field(..., min_length=50, max_length=5000)
-    company: str = Field(..., min_length=2, max_length=100)
-    location: str = Field(..., min_length=2, max_length=100)
-    job_type: JobType
-    experience_level: ExperienceLevel
+    title: JobTitle
+    description: JobDescription
+    company: CompanyName
+    location: LocationName
+    job_type: JobTypeField
+    experience_level: ExperienceLevelField
     salary_min: Optional[int] = Field(None, ge=0)
     salary_max: Optional[int] = Field(None, ge=0)
     required_skills: List[str] = Field(default_factory=list)
@@ -57,12 +76,12 @@ class JobCreate(JobBase):
 
 class JobUpdate(BaseModel):
     """Job update model with optional fields."""
-    title: Optional[str] = Field(None, min_length=3, max_length=200)
-    description: Optional[str] = Field(None, min_length=50, max_length=5000)
-    company: Optional[str] = Field(None, min_length=2, max_length=100)
-    location: Optional[str] = Field(None, min_length=2, max_length=100)
-    job_type: Optional[JobType] = None
-    experience_level: Optional[ExperienceLevel] = None
+    title: Optional[JobTitle] = None
+    description: Optional[JobDescription] = None
+    company: Optional[CompanyName] = None
+    location: Optional[LocationName] = None
+    job_type: Optional[JobTypeField] = None
+    experience_level: Optional[ExperienceLevelField] = None
     salary_min: Optional[int] = Field(None, ge=0)
     salary_max: Optional[int] = Field(None, ge=0)
     required_skills: Optional[List[str]] = None
@@ -70,14 +89,14 @@ class JobUpdate(BaseModel):
     benefits: Optional[List[str]] = None
     requirements: Optional[List[str]] = None
     responsibilities: Optional[List[str]] = None
-    status: Optional[JobStatus] = None
+    status: Optional[JobStatusField] = None
     auto_complete_days: Optional[int] = Field(None, ge=1, le=365)
 
 class JobResponse(JobBase):
     """Job response model."""
     id: str
     hr_id: str
-    status: JobStatus
+    status: JobStatusField
     created_at: datetime
     updated_at: datetime
     application_count: int = 0
@@ -88,15 +107,82 @@ class JobResponse(JobBase):
     completed_at: Optional[datetime] = None  # When job was actually completed
     is_auto_completed: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        ser_json_timedelta='float',
+        populate_by_name=True
+    )
+
+# Firestore fields loaded for JobResponse (search_keywords and other internal fields stay behind)
+JOB_RESPONSE_FIELDS = [field for field in JobResponse.model_fields if field != "id"]
+
+# Validates a whole result page in one call instead of one model per row
+job_response_list_adapter = TypeAdapter(List[JobResponse])
+
+class JobListItem(BaseModel):
+    """Compact job model for list/grid views."""
+    id: str
+    title: str
+    company: str
+    location: str
+    status: JobStatusField
+    created_at: datetime
+    application_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True, extra='ignore')
+
+# Firestore fields loaded for JobListItem rows (the document ID maps to id)
+JOB_LIST_FIELDS = ["title", "company", "location", "status", "created_at", "application_count"]
+
+job_list_item_adapter = TypeAdapter(List[JobListItem])
+
+class JobSummary(BaseModel):
+    """Job card model for browsing: the list fields plus what a job card shows."""
+    id: str
+    title: str
+    description: str
+    company: str
+    location: str
+    job_type: JobTypeField
+    experience_level: ExperienceLevelField
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    required_skills: List[str] = Field(default_factory=list)
+    status: JobStatusField
+    created_at: datetime
+    application_count: int = 0
+    completion_date: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True, extra='ignore')
+
+# Firestore fields loaded for JobSummary rows (the document ID maps to id)
+JOB_SUMMARY_FIELDS = [field for field in JobSummary.model_fields if field != "id"]
+
+job_summary_adapter = TypeAdapter(List[JobSummary])
+
+# Fields tokenized into a job's search_keywords array for full-text search
+SEARCH_KEYWORD_FIELDS = ("title", "company", "description")
+
+# Firestore caps the values in one array-contains-any filter
+MAX_SEARCH_TERMS = 30
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+def search_terms(text: str) -> List[str]:
+    """Split text into distinct lowercase word tokens, in order of appearance."""
+    return list(dict.fromkeys(_WORD_PATTERN.findall(text.lower())))
+
+def job_search_keywords(job: Dict[str, Any]) -> List[str]:
+    """Build the indexed search_keywords array from a job's searchable text fields."""
+    return search_terms(" ".join(job.get(field) or "" for field in SEARCH_KEYWORD_FIELDS))
 
 class JobSearch(BaseModel):
     """Job search model."""
     query: Optional[str] = None
     location: Optional[str] = None
-    job_type: Optional[JobType] = None
-    experience_level: Optional[ExperienceLevel] = None
+    job_type: Optional[JobTypeField] = None
+    experience_level: Optional[ExperienceLevelField] = None
     skills: Optional[List[str]] = None
     salary_min: Optional[int] = Field(None, ge=0)
     salary_max: Optional[int] = Field(None, ge=0)
@@ -107,8 +193,8 @@ class JobApplication(BaseModel):
     """Job application model."""
     job_id: str
     candidate_id: str
-    cover_letter: Optional[str] = Field(None, max_length=2000)
-    application_date: datetime = Field(default_factory=datetime.utcnow)
+    cover_letter: Optional[CoverLetter] = None
+    application_date: datetime = Field(default_factory=utc_now)
     status: str = "pending"  # pending, reviewed, shortlisted, rejected, hired
 
 class JobApplicationResponse(JobApplication):
@@ -119,8 +205,14 @@ class JobApplicationResponse(JobApplication):
     resume_id: Optional[str] = None
     match_score: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        ser_json_timedelta='float',
+        populate_by_name=True
+    )
+
+job_application_list_adapter = TypeAdapter(List[JobApplicationResponse])
 
 class JobAnalytics(BaseModel):
     """Job analytics model."""
@@ -138,7 +230,7 @@ class JobAnalytics(BaseModel):
 
 class JobStatusUpdate(BaseModel):
     """Job status update model."""
-    status: JobStatus
+    status: JobStatusField
     reason: Optional[str] = None
 
 class JobCompletionNotification(BaseModel):
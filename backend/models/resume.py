@@ -3,11 +3,19 @@ Resume models for the Smart Resume Analyzer Platform.
 Defines Pydantic models for resume data and analysis results.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from .job import utc_now
+
+# Constrained string types shared by the parsed-resume models
+ShortText = Annotated[str, StringConstraints(max_length=100)]
+LongText = Annotated[str, StringConstraints(max_length=200)]
+ProjectDescription = Annotated[str, StringConstraints(max_length=1000)]
+ExperienceDescription = Annotated[str, StringConstraints(max_length=2000)]
+
 class ResumeStatus(str, Enum):
     """Resume processing status enumeration."""
     UPLOADED = "uploaded"
@@ -17,35 +25,35 @@ class ResumeStatus(str, Enum):
 
 class Education(BaseModel):
     """Education model."""
-    degree: str = Field(..., max_length=100)
-    institution: str = Field(..., max_length=200)
-    field_of_study: Optional[str] = Field(None, max_length=100)
+    degree: ShortText
+    institution: LongText
+    field_of_study: Optional[ShortText] = None
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     gpa: Optional[float] = Field(None, ge=0.0, le=4.0)
-    location: Optional[str] = Field(None, max_length=100)
+    location: Optional[ShortText] = None
     is_current: bool = False
 
 class Experience(BaseModel):
     """Work experience model."""
-    title: str = Field(..., max_length=100)
-    company: str = Field(..., max_length=200)
-    location: Optional[str] = Field(None, max_length=100)
+    title: ShortText
+    company: LongText
+    location: Optional[ShortText] = None
     start_date: Optional[str] = None
     end_date: Optional[str] = None
     is_current: bool = False
-    description: Optional[str] = Field(None, max_length=2000)
+    description: Optional[ExperienceDescription] = None
     achievements: List[str] = Field(default_factory=list)
 
 class Project(BaseModel):
     """Project model."""
-    name: str = Field(..., max_length=200)
-    description: Optional[str] = Field(None, max_length=1000)
+    name: LongText
+    description: Optional[ProjectDescription] = None
     technologies: List[str] = Field(default_factory=list)
     start_date: Optional[str] = None
     end_date: Optional[str] = None
-    url: Optional[str] = Field(None, max_length=200)
-    github_url: Optional[str] = Field(None, max_length=200)
+    url: Optional[LongText] = None
+    github_url: Optional[LongText] = None
 
 class ResumeBase(BaseModel):
     """Base resume model."""
@@ -68,8 +76,15 @@ class ResumeResponse(ResumeBase):
     parsed_data: Optional[Dict[str, Any]] = None
     analysis_score: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        ser_json_timedelta='float',
+        populate_by_name=True
+    )
+
+# Validates a candidate's resume list in one call instead of one model per row
+resume_response_list_adapter = TypeAdapter(List[ResumeResponse])
 
 class ParsedResumeData(BaseModel):
     """Parsed resume data model."""
@@ -84,6 +99,19 @@ class ParsedResumeData(BaseModel):
     summary: Optional[str] = None
     raw_text: str = ""
 
+class ParsedResumeSummary(BaseModel):
+    """Subset of parsed resume data needed for candidate scoring."""
+    skills: List[str] = Field(default_factory=list)
+    experience: List[Dict[str, Any]] = Field(default_factory=list)
+    education: List[Dict[str, Any]] = Field(default_factory=list)
+
+# Firestore field paths loaded when a resume is only needed for scoring;
+# the full ParsedResumeData is loaded on the detail views only
+RESUME_SCORING_FIELDS = [
+    "candidate_id", "status", "created_at",
+    "parsed_data.skills", "parsed_data.experience", "parsed_data.education"
+]
+
 class ResumeAnalysis(BaseModel):
     """Resume analysis results model."""
     resume_id: str
@@ -97,7 +125,7 @@ class ResumeAnalysis(BaseModel):
     weaknesses: List[str] = Field(default_factory=list)
     suggestions: List[str] = Field(default_factory=list)
     skill_gaps: List[str] = Field(default_factory=list)
-    analysis_date: datetime = Field(default_factory=datetime.utcnow)
+    analysis_date: datetime = Field(default_factory=utc_now)
 
 class CandidateRanking(BaseModel):
     """Candidate ranking model."""
@@ -108,7 +136,7 @@ class CandidateRanking(BaseModel):
     experience_match: float = Field(ge=0.0, le=100.0)
     education_match: float = Field(ge=0.0, le=100.0)
     ranking_position: int
-    ranking_date: datetime = Field(default_factory=datetime.utcnow)
+    ranking_date: datetime = Field(default_factory=utc_now)
     notes: Optional[str] = None
 
 class SkillRecommendation(BaseModel):
@@ -117,5 +145,5 @@ class SkillRecommendation(BaseModel):
     recommended_skills: List[str] = Field(default_factory=list)
     skill_importance: Dict[str, float] = Field(default_factory=dict)
     learning_resources: Dict[str, List[str]] = Field(default_factory=dict)
-    recommendation_date: datetime = Field(default_factory=datetime.utcnow)
+    recommendation_date: datetime = Field(default_factory=utc_now)
     reasoning: List[str] = Field(default_factory=list)
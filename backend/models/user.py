@@ -3,36 +3,60 @@ User models for the Smart Resume Analyzer Platform.
 Defines Pydantic models for HR and Candidate users.
 """
 
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints, field_validator
+from typing import Annotated, Optional, List
 from datetime import datetime
 from enum import Enum
 
+from .common import enum_lookup
+
+# Constrained string types, compiled once and shared by the user models
+FullName = Annotated[str, StringConstraints(min_length=2, max_length=100)]
+PhoneNumber = Annotated[str, StringConstraints(max_length=20)]
+CompanyField = Annotated[str, StringConstraints(max_length=100)]
+Password = Annotated[str, StringConstraints(min_length=6, max_length=100)]
+
+# Shared config: roles are stored as plain strings and unknown keys are dropped
+USER_MODEL_CONFIG = ConfigDict(use_enum_values=True, extra='ignore')
+
 class UserRole(str, Enum):
     """User role enumeration."""
     HR = "hr"
     CANDIDATE = "candidate"
 
+# Role field type with the _value2member_map_ fast path
+UserRoleField = Annotated[UserRole, enum_lookup(UserRole)]
+
 class UserBase(BaseModel):
     """Base user model with common fields."""
+    model_config = USER_MODEL_CONFIG
+    
     email: EmailStr
-    full_name: str = Field(..., min_length=2, max_length=100)
-    phone: Optional[str] = Field(None, max_length=20)
-    company: Optional[str] = Field(None, max_length=100)  # For HR users
-    role: UserRole
+    full_name: FullName
+    phone: Optional[PhoneNumber] = None
+    company: Optional[CompanyField] = None  # For HR users
+    role: UserRoleField
 
 class UserCreate(BaseModel):
     """User creation model."""
     email: EmailStr
-    full_name: str = Field(..., min_length=2, max_length=100)
-    phone: Optional[str] = Field(None, max_length=20)
-    company: Optional[str] = Field(None, max_length=100)
-    password: str = Field(..., min_length=6, max_length=100)
+    full_name: FullName
+    phone: Optional[PhoneNumber] = None
+    company: Optional[CompanyField] = None
+    password: Password
 
 class UserLogin(BaseModel):
     """User login model."""
-    email: EmailStr
+    # Plain str: addresses are validated when accounts are created, not on every login
+    email: str
     password: str
+    
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, value: str) -> str:
+        """Normalise the address the way EmailStr does at registration."""
+        local, at, domain = value.strip().rpartition("@")
+        return f"{local}@{domain.lower()}" if at else domain
 
 class UserResponse(UserBase):
     """User response model (without password)."""
@@ -41,9 +65,6 @@ class UserResponse(UserBase):
     updated_at: datetime
     is_active: bool = True
 
-    class Config:
-        from_attributes = True
-
 class UserInDB(UserBase):
     """User model for database storage."""
     id: str
@@ -80,6 +101,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     """Token data model for JWT payload."""
+    model_config = USER_MODEL_CONFIG
+    
     user_id: str
     email: str
-    role: UserRole
+    role: UserRoleField
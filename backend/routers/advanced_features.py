@@ -5,20 +5,99 @@ ontology, and bias detection features.
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
+from collections import Counter
 from datetime import datetime
-import uuid
+from pathlib import Path
+import os
+import asyncio
+import tempfile
+import aiofiles
 
 from database.firebase_adapter import get_collection
 from auth.jwt_handler import get_current_user, get_current_hr_user
+from utils.async_cache import async_ttl_cache
 from services.enhanced_nlp_service import (
     parse_resume_enhanced, calculate_enhanced_candidate_score,
     generate_enhanced_skill_recommendations, get_enhanced_service_capabilities,
     train_ml_models, generate_bias_report
 )
+# Already loaded by enhanced_nlp_service, so these add no import-time cost
+from services.bias_service import analyze_candidate_bias
+from services.ocr_service import parse_image_resume
+from services.llm_service import analyze_resume_with_llm
+from services.multilingual_service import get_multilingual_capabilities
+from services.ontology_service import get_ontology_stats as compute_ontology_stats
 
 router = APIRouter()
 
+# Temporary upload directory, created once at import
+TEMP_DIR = Path("uploads/temp")
+TEMP_DIR.mkdir(parents=True, exist_ok=True)
+
+# Uploads are copied to disk in chunks of this size (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Number of most demanded skills passed to the recommendation engine
+TOP_MARKET_SKILLS = 100
+
+# Reporting windows shown on the bias dashboard, and the per-report time budget
+BIAS_DASHBOARD_PERIODS = (7, 30, 90)
+BIAS_REPORT_TIMEOUT = 10  # seconds
+
+# Capabilities, ontology stats and the bias dashboard change over minutes, not requests
+SLOW_DATA_CACHE_TTL = 300  # seconds
+
+async def _save_upload_to_temp(file: UploadFile, file_extension: str) -> str:
+    """Stream an uploaded file to a unique temp file and return its path."""
+    fd, temp_path = tempfile.mkstemp(prefix="temp_", suffix=f".{file_extension}", dir=TEMP_DIR)
+    os.close(fd)
+    async with aiofiles.open(temp_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+    return temp_path
+
+@async_ttl_cache(ttl=SLOW_DATA_CACHE_TTL)
+async def _cached_service_capabilities() -> Dict[str, Any]:
+    """Capabilities of all advanced services, cached."""
+    return await get_enhanced_service_capabilities()
+
+@async_ttl_cache(ttl=SLOW_DATA_CACHE_TTL)
+async def _cached_ontology_stats() -> Dict[str, Any]:
+    """Ontology statistics, cached."""
+    return await compute_ontology_stats()
+
+@async_ttl_cache(ttl=SLOW_DATA_CACHE_TTL)
+async def _cached_multilingual_capabilities() -> Dict[str, Any]:
+    """Supported languages for multilingual processing, cached."""
+    return await get_multilingual_capabilities()
+
+@async_ttl_cache(ttl=SLOW_DATA_CACHE_TTL)
+async def _build_bias_dashboard(periods: tuple) -> Dict[str, Any]:
+    """Generate the bias reports for each period concurrently, cached per period set."""
+    # Each report is bounded by a timeout
+    reports = await asyncio.gather(*(
+        asyncio.wait_for(generate_bias_report(days), timeout=BIAS_REPORT_TIMEOUT)
+        for days in periods
+    ), return_exceptions=True)
+    
+    bias_reports = []
+    for days, report in zip(periods, reports):
+        if isinstance(report, asyncio.TimeoutError):
+            report = {'error': f'Report timed out after {BIAS_REPORT_TIMEOUT}s'}
+        elif isinstance(report, Exception):
+            report = {'error': str(report)}
+        bias_reports.append({
+            'period_days': days,
+            'report': report
+        })
+    
+    return {
+        'bias_reports': bias_reports,
+        'dashboard_updated': datetime.now()
+    }
+
 @router.post("/resumes/parse-enhanced")
 async def parse_resume_with_advanced_features(
     file: UploadFile = File(...),
@@ -26,34 +105,24 @@ async def parse_resume_with_advanced_features(
     current_user: dict = Depends(get_current_user)
 ):
     """Parse resume with all advanced features (OCR, multilingual, LLM)."""
+    temp_path = None
     try:
         # Save uploaded file temporarily
         file_extension = file.filename.split('.')[-1].lower()
-        temp_filename = f"temp_{uuid.uuid4().hex}.{file_extension}"
-        temp_path = f"uploads/temp/{temp_filename}"
-        
-        # Create temp directory if it doesn't exist
-        import os
-        os.makedirs("uploads/temp", exist_ok=True)
-        
-        # Save file
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        temp_path = await _save_upload_to_temp(file, file_extension)
         
         # Parse with enhanced features
-        result = await parse_resume_enhanced(temp_path, file_extension, language)
-        
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        return result
+        return await parse_resume_enhanced(temp_path, file_extension, language)
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Enhanced parsing failed: {str(e)}"
         )
+    finally:
+        # Clean up temp file
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
 @router.post("/candidates/score-enhanced")
 async def calculate_enhanced_candidate_score_endpoint(
@@ -79,8 +148,10 @@ async def get_enhanced_skill_recommendations_endpoint(
     try:
         # Get user's resume data
         resumes_collection = get_collection("resumes")
+        # Only parsed_data is needed; served by the (candidate_id, status, created_at) index
         latest_resume = await resumes_collection.find_one(
             {"candidate_id": current_user.user_id, "status": "processed"},
+            {"parsed_data": 1},
             sort=[("created_at", -1)]
         )
         
@@ -90,19 +161,20 @@ async def get_enhanced_skill_recommendations_endpoint(
                 detail="No processed resume found"
             )
         
-        # Get market trends
+        # Get market trends, streaming only the skills field of each active job
         jobs_collection = get_collection("jobs")
-        all_jobs = await jobs_collection.find({"status": "active"}).to_list(length=None)
-        
-        # Extract market trends
-        skill_frequency = {}
-        for job in all_jobs:
-            for skill in job.get("required_skills", []):
-                skill_frequency[skill] = skill_frequency.get(skill, 0) + 1
+        skill_frequency = Counter()
+        total_jobs = 0
+        async for job in jobs_collection.find({"status": "active"}, {"required_skills": 1}):
+            skill_frequency.update(job.get("required_skills", ()))
+            total_jobs += 1
         
         market_trends = {
-            'top_skills': [{'skill': skill, 'count': count} for skill, count in skill_frequency.items()],
-            'total_jobs': len(all_jobs)
+            'top_skills': [
+                {'skill': skill, 'count': count}
+                for skill, count in skill_frequency.most_common(TOP_MARKET_SKILLS)
+            ],
+            'total_jobs': total_jobs
         }
         
         # Generate enhanced recommendations
@@ -118,14 +190,14 @@ async def get_enhanced_skill_recommendations_endpoint(
             detail=f"Enhanced recommendations failed: {str(e)}"
         )
 
-@router.get("/capabilities")
+@router.get("/capabilities", response_model=None)
 async def get_service_capabilities(
     current_user: dict = Depends(get_current_user)
 ):
     """Get capabilities of all advanced services."""
     try:
-        capabilities = await get_enhanced_service_capabilities()
-        return capabilities
+        # Trusted service payload: encode directly, skipping jsonable_encoder
+        return ORJSONResponse(content=await _cached_service_capabilities())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -147,7 +219,7 @@ async def train_ml_models_endpoint(
             detail=f"ML model training failed: {str(e)}"
         )
 
-@router.get("/bias/report")
+@router.get("/bias/report", response_model=None)
 async def get_bias_report_endpoint(
     time_period_days: int = 30,
     current_user: dict = Depends(get_current_hr_user)
@@ -155,7 +227,8 @@ async def get_bias_report_endpoint(
     """Get bias detection report (HR only)."""
     try:
         result = await generate_bias_report(time_period_days)
-        return result
+        # Trusted service payload: encode directly, skipping jsonable_encoder
+        return ORJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -169,18 +242,7 @@ async def get_bias_dashboard(
     """Get bias detection dashboard data (HR only)."""
     try:
         # Get recent bias reports
-        bias_reports = []
-        for days in [7, 30, 90]:
-            report = await generate_bias_report(days)
-            bias_reports.append({
-                'period_days': days,
-                'report': report
-            })
-        
-        return {
-            'bias_reports': bias_reports,
-            'dashboard_updated': datetime.now().isoformat()
-        }
+        return await _build_bias_dashboard(BIAS_DASHBOARD_PERIODS)
         
     except Exception as e:
         raise HTTPException(
@@ -197,8 +259,6 @@ async def analyze_candidate_bias_endpoint(
 ):
     """Analyze candidate for potential bias (HR only)."""
     try:
-        from services.bias_service import analyze_candidate_bias
-        
         result = await analyze_candidate_bias(candidate_data, ranking_score, job_requirements)
         return result
         
@@ -208,16 +268,14 @@ async def analyze_candidate_bias_endpoint(
             detail=f"Bias analysis failed: {str(e)}"
         )
 
-@router.get("/ontology/stats")
+@router.get("/ontology/stats", response_model=None)
 async def get_ontology_stats(
     current_user: dict = Depends(get_current_user)
 ):
     """Get ontology statistics."""
     try:
-        from services.ontology_service import get_ontology_stats
-        
-        stats = await get_ontology_stats()
-        return stats
+        # Trusted service payload: encode directly, skipping jsonable_encoder
+        return ORJSONResponse(content=await _cached_ontology_stats())
         
     except Exception as e:
         raise HTTPException(
@@ -231,10 +289,7 @@ async def get_supported_languages(
 ):
     """Get supported languages for multilingual processing."""
     try:
-        from services.multilingual_service import get_multilingual_capabilities
-        
-        capabilities = await get_multilingual_capabilities()
-        return capabilities
+        return await _cached_multilingual_capabilities()
         
     except Exception as e:
         raise HTTPException(
@@ -249,35 +304,24 @@ async def process_image_resume(
     current_user: dict = Depends(get_current_user)
 ):
     """Process image-based resume using OCR."""
+    temp_path = None
     try:
         # Save uploaded file temporarily
         file_extension = file.filename.split('.')[-1].lower()
-        temp_filename = f"temp_{uuid.uuid4().hex}.{file_extension}"
-        temp_path = f"uploads/temp/{temp_filename}"
-        
-        # Create temp directory if it doesn't exist
-        import os
-        os.makedirs("uploads/temp", exist_ok=True)
-        
-        # Save file
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        temp_path = await _save_upload_to_temp(file, file_extension)
         
         # Process with OCR
-        from services.ocr_service import parse_image_resume
-        result = await parse_image_resume(temp_path, file_extension, language)
-        
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        return result
+        return await parse_image_resume(temp_path, file_extension, language)
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"OCR processing failed: {str(e)}"
         )
+    finally:
+        # Clean up temp file
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
 @router.get("/llm/analysis")
 async def get_llm_analysis(
@@ -287,8 +331,6 @@ async def get_llm_analysis(
 ):
     """Get LLM-based analysis of resume."""
     try:
-        from services.llm_service import analyze_resume_with_llm
-        
         result = await analyze_resume_with_llm(resume_data, job_requirements)
         return result
         
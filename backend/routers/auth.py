@@ -4,31 +4,75 @@ Handles HR and Candidate authentication endpoints.
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import datetime, timedelta
-from typing import Optional
-import uuid
+from typing import Optional, Tuple
+import hmac
+import time
 
-from database.firebase_adapter import get_collection
+from database.firebase_adapter import get_collection, new_document_id, ReturnDocument
 from models.user import (
     UserCreate, UserLogin, UserResponse, Token, UserRole,
     HRProfile, CandidateProfile, UserInDB
 )
 from auth.jwt_handler import (
     verify_password, get_password_hash, create_access_token,
-    get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_current_user, revoke_token, ACCESS_TOKEN_EXPIRE_MINUTES, DUMMY_PASSWORD_HASH
 )
+from utils.request_time import get_request_time
 
 router = APIRouter()
 security = HTTPBearer()
 
+# Fields needed to build a UserResponse; keeps hashed_password off the wire
+USER_RESPONSE_FIELDS = {
+    field: 1 for field in (
+        "email", "full_name", "phone", "company", "role",
+        "created_at", "updated_at", "is_active"
+    )
+}
+
+# Built-in admin account
+ADMIN_EMAIL = "admin@resumeanalyzer.com"
+_ADMIN_EMAIL_BYTES = ADMIN_EMAIL.encode()
+_ADMIN_PASSWORD_BYTES = b"password123@"
+
+# Admin user document, cached after the first admin login: (expires_at, user)
+ADMIN_CACHE_TTL = 300  # seconds
+_admin_user: Optional[Tuple[float, dict]] = None
+
+async def _get_admin_user() -> Optional[dict]:
+    """Return the admin user document, loading it at most once per TTL."""
+    global _admin_user
+    if _admin_user is not None and _admin_user[0] > time.monotonic():
+        return _admin_user[1]
+    
+    user = await get_collection("users").find_one({"email": ADMIN_EMAIL}, use_cache=False)
+    if user:
+        _admin_user = (time.monotonic() + ADMIN_CACHE_TTL, user)
+    return user
+
+def _to_user_response(user: dict, role: Optional[str] = None) -> dict:
+    """Shape a trusted user document as a UserResponse dict; response_model checks it once."""
+    return {
+        "id": user["_id"],
+        "email": user["email"],
+        "full_name": user["full_name"],
+        "phone": user.get("phone"),
+        "company": user.get("company"),
+        "role": UserRole(role or user["role"]).value,
+        "created_at": user["created_at"],
+        "updated_at": user["updated_at"],
+        "is_active": user.get("is_active", True)
+    }
+
 @router.post("/register", response_model=UserResponse)
-async def register_user(user_data: UserCreate):
+async def register_user(user_data: UserCreate, now: datetime = Depends(get_request_time)):
     """Register a new candidate user only."""
     users_collection = get_collection("users")
     
     # Check if user already exists
-    existing_user = await users_collection.find_one({"email": user_data.email})
+    existing_user = await users_collection.find_one({"email": user_data.email}, use_cache=False)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,8 +83,8 @@ async def register_user(user_data: UserCreate):
     user_role = "candidate"
     
     # Create user document
-    user_id = str(uuid.uuid4())
-    hashed_password = get_password_hash(user_data.password)
+    user_id = new_document_id()
+    hashed_password = await get_password_hash(user_data.password)
     
     user_doc = {
         "_id": user_id,
@@ -50,8 +94,8 @@ async def register_user(user_data: UserCreate):
         "company": user_data.company,
         "role": user_role,  # Always candidate
         "hashed_password": hashed_password,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "created_at": now,
+        "updated_at": now,
         "is_active": True
     }
     
@@ -64,27 +108,17 @@ async def register_user(user_data: UserCreate):
         )
     
     # Return user response (without password)
-    return UserResponse(
-        id=user_id,
-        email=user_data.email,
-        full_name=user_data.full_name,
-        phone=user_data.phone,
-        company=user_data.company,
-        role=user_role,
-        created_at=user_doc["created_at"],
-        updated_at=user_doc["updated_at"],
-        is_active=True
-    )
+    return _to_user_response(user_doc)
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, response_model_exclude_none=True)
 async def login_user(login_data: UserLogin):
     """Authenticate user and return access token."""
-    users_collection = get_collection("users")
-    
-    # Special case: admin login
-    if login_data.email == "admin@resumeanalyzer.com" and login_data.password == "password123@":
+    # Special case: admin login, checked before any database call
+    is_admin = hmac.compare_digest(login_data.email.encode(), _ADMIN_EMAIL_BYTES)
+    is_admin_password = hmac.compare_digest(login_data.password.encode(), _ADMIN_PASSWORD_BYTES)
+    if is_admin and is_admin_password:
         # Find admin user
-        user = await users_collection.find_one({"email": "admin@resumeanalyzer.com"})
+        user = await _get_admin_user()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -110,33 +144,21 @@ async def login_user(login_data: UserLogin):
         )
         
         # Return token and user info
-        return Token(
-            access_token=access_token,
-            token_type="bearer",
-            expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            user=UserResponse(
-                id=user["_id"],
-                email=user["email"],
-                full_name=user["full_name"],
-                phone=user.get("phone"),
-                company=user.get("company"),
-                role="hr",
-                created_at=user["created_at"],
-                updated_at=user["updated_at"],
-                is_active=user.get("is_active", True)
-            )
-        )
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "user": _to_user_response(user, "hr")
+        }
     
     # Regular user login (candidates only)
-    user = await users_collection.find_one({"email": login_data.email})
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password"
-        )
+    users_collection = get_collection("users")
+    # Credentials are always read from Firestore, never from the query cache
+    user = await users_collection.find_one({"email": login_data.email}, use_cache=False)
     
-    # Verify password
-    if not verify_password(login_data.password, user["hashed_password"]):
+    # Verify password (against the dummy hash for unknown emails)
+    hashed_password = user["hashed_password"] if user else DUMMY_PASSWORD_HASH
+    if not await verify_password(login_data.password, hashed_password) or not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -164,58 +186,40 @@ async def login_user(login_data: UserLogin):
     )
     
     # Return token and user info
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user=UserResponse(
-            id=user["_id"],
-            email=user["email"],
-            full_name=user["full_name"],
-            phone=user.get("phone"),
-            company=user.get("company"),
-            role=user_role,
-            created_at=user["created_at"],
-            updated_at=user["updated_at"],
-            is_active=user.get("is_active", True)
-        )
-    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "user": _to_user_response(user, user_role)
+    }
 
-@router.get("/me", response_model=UserResponse)
+@router.get("/me", response_model=UserResponse, response_model_exclude_none=True)
 async def get_current_user_profile(current_user: dict = Depends(get_current_user)):
     """Get current user's profile information."""
     users_collection = get_collection("users")
     
-    user = await users_collection.find_one({"_id": current_user.user_id})
+    user = await users_collection.find_one({"_id": current_user.user_id}, USER_RESPONSE_FIELDS)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserResponse(
-        id=user["_id"],
-        email=user["email"],
-        full_name=user["full_name"],
-        phone=user.get("phone"),
-        company=user.get("company"),
-        role=user["role"],
-        created_at=user["created_at"],
-        updated_at=user["updated_at"],
-        is_active=user.get("is_active", True)
-    )
+    return _to_user_response(user)
 
 @router.put("/profile", response_model=UserResponse)
 async def update_user_profile(
     profile_data: dict,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Update user profile information."""
+    global _admin_user
     users_collection = get_collection("users")
     
     # Prepare update data
     update_data = {
-        "updated_at": datetime.utcnow()
+        "updated_at": now
     }
     
     # Add allowed fields to update
@@ -224,35 +228,34 @@ async def update_user_profile(
         if field in profile_data:
             update_data[field] = profile_data[field]
     
-    # Update user in database
-    result = await users_collection.update_one(
+    # Update user in database and get the updated document back
+    updated_user = await users_collection.find_one_and_update(
         {"_id": current_user.user_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection=USER_RESPONSE_FIELDS,
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.modified_count == 0:
+    if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to update profile"
         )
     
+    # The cached admin document is stale once the admin edits their profile
+    if _admin_user is not None and _admin_user[1]["_id"] == current_user.user_id:
+        _admin_user = None
+    
     # Return updated user
-    updated_user = await users_collection.find_one({"_id": current_user.user_id})
-    return UserResponse(
-        id=updated_user["_id"],
-        email=updated_user["email"],
-        full_name=updated_user["full_name"],
-        phone=updated_user.get("phone"),
-        company=updated_user.get("company"),
-        role=updated_user["role"],
-        created_at=updated_user["created_at"],
-        updated_at=updated_user["updated_at"],
-        is_active=updated_user.get("is_active", True)
-    )
+    return _to_user_response(updated_user)
 
 @router.post("/logout")
-async def logout_user(current_user: dict = Depends(get_current_user)):
-    """Logout user (client-side token removal)."""
+async def logout_user(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """Logout user (client-side token removal plus server-side revocation)."""
+    revoke_token(credentials.credentials)
     return {"message": "Successfully logged out"}
 
 @router.get("/verify-token")
@@ -3,36 +3,89 @@ Candidate management router for HR users.
 Handles candidate ranking, scoring, and management for job applications.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from datetime import datetime
-import uuid
+from datetime import datetime, timezone
+import asyncio
+import re
+import orjson
 
 from database.firebase_adapter import get_collection
-from models.resume import CandidateRanking
+from models.resume import CandidateRanking, ParsedResumeSummary, RESUME_SCORING_FIELDS
 from models.job import JobApplicationResponse
 from auth.jwt_handler import get_current_hr_user, get_current_user
-from services.nlp_service import calculate_candidate_score
+from services.nlp_service import calculate_candidate_scores
+from utils.request_time import get_request_time
+from utils.pagination import get_page_cursor, newest_first
+from utils.async_cache import async_ttl_cache
 
 router = APIRouter()
 
-@router.get("/job/{job_id}/rankings", response_model=List[CandidateRanking])
+# Fields each read in this router actually uses
+PROJECTIONS = {
+    "job_owner": {"hr_id": 1},
+    "job_requirements": {
+        "hr_id": 1, "required_skills": 1, "preferred_skills": 1,
+        "experience_level": 1, "job_type": 1, "updated_at": 1
+    },
+    "application_candidate": {"candidate_id": 1},
+    "application_job": {"job_id": 1},
+    "candidate_contact": {"full_name": 1, "email": 1},
+    "candidate_profile": {"full_name": 1, "email": 1, "phone": 1, "role": 1},
+    "resume_ref": {"candidate_id": 1},
+    "resume_summary": {
+        "candidate_id": 1, "filename": 1, "file_type": 1,
+        "status": 1, "analysis_score": 1, "created_at": 1
+    },
+    "ranking_score": {"match_score": 1},
+}
+
+# Note on fallback rankings, which are returned but never stored
+RANKING_ERROR_NOTE = "Error generating ranking"
+
+# Seconds a computed ranking list is reused for repeated views of the same job
+RANKINGS_CACHE_TTL = 30
+
+# Applications enriched per batch of lookups when streaming
+STREAM_BATCH_SIZE = 100
+
+# Safety bound on the applications a non-streaming endpoint loads into memory
+MAX_APPLICATION_ROWS = 10000
+
+# Fields of a stored ranking document that make up the API response
+RANKING_RESPONSE_FIELDS = tuple(CandidateRanking.model_fields)
+
+# Rankings and applications are shaped to the API contract here, so these routes skip
+# response-model re-validation; `responses` keeps the schema in the OpenAPI docs
+@router.get(
+    "/job/{job_id}/rankings",
+    response_model=None,
+    responses={200: {"model": List[CandidateRanking]}}
+)
 async def get_candidate_rankings(
     job_id: str,
-    current_user: dict = Depends(get_current_hr_user)
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; every ranking when omitted"),
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Get ranked candidates for a specific job (HR only)."""
     jobs_collection = get_collection("jobs")
     applications_collection = get_collection("applications")
-    rankings_collection = get_collection("candidate_rankings")
-    resumes_collection = get_collection("resumes")
-    users_collection = get_collection("users")
     
-    # Check if job belongs to current HR
-    job = await jobs_collection.find_one({
-        "_id": job_id,
-        "hr_id": current_user.user_id
-    })
+    # Check if job belongs to current HR while loading its applications; the
+    # applications are discarded unless the check passes
+    job, applications = await asyncio.gather(
+        jobs_collection.find_one({
+            "_id": job_id,
+            "hr_id": current_user.user_id
+        }, PROJECTIONS["job_requirements"]),
+        applications_collection.find(
+            {"job_id": job_id}, PROJECTIONS["application_candidate"]
+        ).to_list(length=MAX_APPLICATION_ROWS)
+    )
     
     if not job:
         raise HTTPException(
@@ -40,131 +93,212 @@ async def get_candidate_rankings(
             detail="Job not found or access denied"
         )
     
-    # Get all applications for this job
-    applications = await applications_collection.find({"job_id": job_id}).to_list(length=None)
-    
     if not applications:
+        response.headers["X-Total-Count"] = "0"
         return []
     
-    # Generate rankings for each candidate
-    rankings = []
-    for i, application in enumerate(applications):
+    ranking_docs = await _fetch_rankings(job_id, job, applications, now)
+    response.headers["X-Total-Count"] = str(len(ranking_docs))
+    
+    # Positions are computed over every applicant; only the requested page is returned
+    page = ranking_docs[skip:] if limit is None else ranking_docs[skip:skip + limit]
+    return [{field: doc.get(field) for field in RANKING_RESPONSE_FIELDS} for doc in page]
+
+@async_ttl_cache(
+    ttl=RANKINGS_CACHE_TTL,
+    maxsize=256,
+    key=lambda job_id, job, applications, now: (job_id, job.get("updated_at"), len(applications))
+)
+async def _fetch_rankings(job_id: str, job: dict, applications: List[dict], now: datetime) -> List[dict]:
+    """Rank every applicant with a processed resume; cached per (job, job.updated_at, applicant count)."""
+    rankings_collection = get_collection("candidate_rankings")
+    resumes_collection = get_collection("resumes")
+    
+    # Load every applicant's latest processed resume and existing ranking in batches
+    candidate_ids = [application["candidate_id"] for application in applications]
+    latest_resumes, existing_rankings = await asyncio.gather(
+        resumes_collection.find_latest_in(
+            "candidate_id", candidate_ids,
+            query={"status": "processed"},
+            projection=RESUME_SCORING_FIELDS
+        ),
+        rankings_collection.find_in("candidate_id", candidate_ids, {"job_id": job_id})
+    )
+    rankings_by_candidate = {ranking["candidate_id"]: ranking for ranking in existing_rankings}
+    
+    # Generate rankings for each candidate with a processed resume
+    ranking_docs = []
+    missing = []
+    for application in applications:
         candidate_id = application["candidate_id"]
-        
-        # Get candidate's latest resume
-        resume = await resumes_collection.find_one(
-            {"candidate_id": candidate_id, "status": "processed"},
-            sort=[("created_at", -1)]
-        )
-        
+        resume = latest_resumes.get(candidate_id)
         if not resume:
             continue
         
-        # Get or generate ranking
-        existing_ranking = await rankings_collection.find_one({
-            "candidate_id": candidate_id,
-            "job_id": job_id
-        })
-        
+        existing_ranking = rankings_by_candidate.get(candidate_id)
         if existing_ranking:
-            rankings.append(CandidateRanking(**existing_ranking))
+            ranking_docs.append(existing_ranking)
         else:
-            # Generate new ranking
-            ranking = await generate_candidate_ranking(
-                candidate_id, job_id, resume, job
-            )
-            rankings.append(ranking)
-    
-    # Sort rankings by match score
-    rankings.sort(key=lambda x: x.match_score, reverse=True)
-    
-    # Update ranking positions
-    for i, ranking in enumerate(rankings):
-        ranking.ranking_position = i + 1
-        await rankings_collection.update_one(
-            {"_id": ranking.id},
-            {"$set": {"ranking_position": i + 1}}
-        )
+            missing.append((candidate_id, resume))
+    
+    # Only the scoring subset of the parsed resume data is needed; unparseable resumes get a fallback ranking
+    parsed_by_candidate = {}
+    for candidate_id, resume in missing:
+        try:
+            parsed_by_candidate[candidate_id] = ParsedResumeSummary(**(resume.get("parsed_data") or {})).model_dump()
+        except Exception:
+            continue
+    
+    # Score every candidate without a stored ranking in one batched call
+    job_requirements = {
+        "required_skills": job.get("required_skills", []),
+        "preferred_skills": job.get("preferred_skills", []),
+        "experience_level": job.get("experience_level"),
+        "job_type": job.get("job_type")
+    }
+    scores_list = await calculate_candidate_scores(list(parsed_by_candidate.values()), job_requirements)
+    scores_by_candidate = dict(zip(parsed_by_candidate, scores_list))
+    
+    new_docs = [
+        build_ranking_doc(candidate_id, job_id, scores_by_candidate.get(candidate_id), ranking_date=now)
+        for candidate_id, _ in missing
+    ]
+    new_ids = {doc["_id"] for doc in new_docs}
+    ranking_docs.extend(new_docs)
+    
+    # Sort rankings by match score; ties keep their stored order so equal scores
+    # do not swap positions (and trigger writes) between calls
+    ranking_docs.sort(key=lambda doc: (
+        -doc["match_score"],
+        doc["ranking_position"] if doc["_id"] not in new_ids and doc.get("ranking_position") else float("inf"),
+        doc["candidate_id"]
+    ))
+    
+    # Assign positions; stored rankings are rewritten only when their position moved
+    position_updates = []
+    for position, doc in enumerate(ranking_docs, start=1):
+        if doc["_id"] not in new_ids and doc.get("ranking_position") != position:
+            position_updates.append((doc["_id"], {"ranking_position": position}))
+        doc["ranking_position"] = position
+    
+    # New rankings are written once, already carrying their final position
+    await asyncio.gather(
+        rankings_collection.insert_many(
+            [doc for doc in new_docs if doc["notes"] != RANKING_ERROR_NOTE]
+        ),
+        rankings_collection.bulk_update(position_updates)
+    )
     
-    return rankings
+    return ranking_docs
 
-async def generate_candidate_ranking(
+def build_ranking_doc(
     candidate_id: str,
     job_id: str,
-    resume: dict,
-    job: dict
-) -> CandidateRanking:
-    """Generate candidate ranking based on resume and job requirements."""
-    rankings_collection = get_collection("candidate_rankings")
+    scores: Optional[dict],
+    ranking_date: Optional[datetime] = None
+) -> dict:
+    """Build the ranking document for a scored candidate (not saved); scores=None yields the fallback ranking."""
+    ranking_date = ranking_date or datetime.now(timezone.utc)
+    # One ranking per (job, candidate): concurrent generations overwrite instead of duplicating
+    ranking_doc = {
+        "_id": f"{job_id}_{candidate_id}",
+        "candidate_id": candidate_id,
+        "job_id": job_id,
+        "ranking_position": 0,  # Will be updated after sorting
+        "ranking_date": ranking_date
+    }
     
-    try:
-        # Get parsed resume data
-        parsed_data = resume.get("parsed_data", {})
-        
-        # Prepare job requirements
-        job_requirements = {
-            "required_skills": job.get("required_skills", []),
-            "preferred_skills": job.get("preferred_skills", []),
-            "experience_level": job.get("experience_level"),
-            "job_type": job.get("job_type")
-        }
-        
-        # Calculate scores using NLP service
-        scores = await calculate_candidate_score(parsed_data, job_requirements)
-        
-        # Create ranking document
-        ranking_id = str(uuid.uuid4())
-        ranking_doc = {
-            "_id": ranking_id,
-            "candidate_id": candidate_id,
-            "job_id": job_id,
+    if scores is None:
+        # Default ranking on error
+        ranking_doc.update({
+            "match_score": 0.0,
+            "skills_match": 0.0,
+            "experience_match": 0.0,
+            "education_match": 0.0,
+            "notes": RANKING_ERROR_NOTE
+        })
+    else:
+        ranking_doc.update({
             "match_score": scores["overall_score"],
             "skills_match": scores["skill_score"],
             "experience_match": scores["experience_score"],
             "education_match": scores["education_score"],
-            "ranking_position": 0,  # Will be updated after sorting
-            "ranking_date": datetime.utcnow(),
             "notes": f"Auto-generated ranking based on {len(scores.get('matched_skills', []))} matched skills"
-        }
-        
-        # Save ranking
-        await rankings_collection.insert_one(ranking_doc)
-        
-        return CandidateRanking(**ranking_doc)
-        
-    except Exception as e:
-        # Return default ranking on error
-        ranking_id = str(uuid.uuid4())
-        return CandidateRanking(
-            id=ranking_id,
-            candidate_id=candidate_id,
-            job_id=job_id,
-            match_score=0.0,
-            skills_match=0.0,
-            experience_match=0.0,
-            education_match=0.0,
-            ranking_position=0,
-            ranking_date=datetime.utcnow(),
-            notes="Error generating ranking"
-        )
+        })
+    
+    return ranking_doc
 
-@router.get("/job/{job_id}/applications", response_model=List[JobApplicationResponse])
+@router.get(
+    "/job/{job_id}/applications",
+    response_model=None,
+    responses={200: {"model": List[JobApplicationResponse]}}
+)
 async def get_job_applications_with_details(
     job_id: str,
+    response: Response,
+    application_status: Optional[str] = Query(None, alias="status", description="Only applications with this status"),
+    search: Optional[str] = Query(None, max_length=100, description="Candidate name or email contains this text"),
+    limit: int = Query(50, ge=1, le=100),
+    page_after: Optional[list] = Depends(get_page_cursor),
     current_user: dict = Depends(get_current_hr_user)
 ):
-    """Get detailed applications for a job with candidate information."""
+    """Get one page of a job's applications, newest first, with candidate information."""
     jobs_collection = get_collection("jobs")
     applications_collection = get_collection("applications")
-    users_collection = get_collection("users")
-    resumes_collection = get_collection("resumes")
-    rankings_collection = get_collection("candidate_rankings")
     
     # Check if job belongs to current HR
     job = await jobs_collection.find_one({
         "_id": job_id,
         "hr_id": current_user.user_id
-    })
+    }, PROJECTIONS["job_owner"])
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or access denied"
+        )
+    
+    # Filters are applied before paging, so every page and the total cover all matches
+    applications_query = {"job_id": job_id}
+    if application_status:
+        applications_query["status"] = application_status
+    search = search.strip() if search else ""
+    if search:
+        candidate_ids = await _search_applicants(applications_query, search)
+        if not candidate_ids:
+            response.headers["X-Total-Count"] = "0"
+            return []
+        # Names and emails live on the users, so the match is checked client-side
+        applications_query["$and"] = [{"candidate_id": {"$in": candidate_ids}}]
+    
+    # Count and load a page of the matches, sorted and paged by Firestore using the
+    # (job_id, application_date) index
+    cursor = applications_collection.find(applications_query).sort(newest_first("application_date"))
+    if page_after is not None:
+        cursor = cursor.start_after(page_after)
+    total, applications = await asyncio.gather(
+        applications_collection.count_documents(applications_query),
+        cursor.limit(limit).to_list(length=limit)
+    )
+    response.headers["X-Total-Count"] = str(total)
+    
+    # Only the requested page is enriched
+    return await _enrich_applications(job_id, applications)
+
+@router.get("/job/{job_id}/applications/stream")
+async def stream_job_applications(
+    job_id: str,
+    current_user: dict = Depends(get_current_hr_user)
+):
+    """Stream every application for a job as NDJSON, in application order (HR only)."""
+    jobs_collection = get_collection("jobs")
+    applications_collection = get_collection("applications")
+    
+    # Check if job belongs to current HR
+    job = await jobs_collection.find_one({
+        "_id": job_id,
+        "hr_id": current_user.user_id
+    }, PROJECTIONS["job_owner"])
     
     if not job:
         raise HTTPException(
@@ -172,26 +306,71 @@ async def get_job_applications_with_details(
             detail="Job not found or access denied"
         )
     
-    # Get applications
-    applications = await applications_collection.find({"job_id": job_id}).to_list(length=None)
+    async def generate_lines():
+        # Enrich and emit one batch at a time so memory stays flat however many applicants there are
+        batch = []
+        async for application in applications_collection.find({"job_id": job_id}):
+            batch.append(application)
+            if len(batch) == STREAM_BATCH_SIZE:
+                for enriched_app in await _enrich_applications(job_id, batch):
+                    yield orjson.dumps(enriched_app, default=_json_default) + b"\n"
+                batch = []
+        if batch:
+            for enriched_app in await _enrich_applications(job_id, batch):
+                yield orjson.dumps(enriched_app, default=_json_default) + b"\n"
+    
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+def _json_default(value):
+    """Encode Firestore timestamps (datetime subclasses orjson rejects) as ISO strings."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+async def _search_applicants(applications_query: dict, search: str) -> List[str]:
+    """IDs of a job's applicants whose name or email contains the search text."""
+    candidate_ids = list({
+        application["candidate_id"]
+        async for application in get_collection("applications").find(
+            applications_query, PROJECTIONS["application_candidate"]
+        )
+    })
+    candidates = await get_collection("users").find_in(
+        "_id", candidate_ids, projection=PROJECTIONS["candidate_contact"]
+    )
+    needle = search.casefold()
+    return [
+        candidate["_id"] for candidate in candidates
+        if needle in candidate.get("full_name", "").casefold()
+        or needle in candidate.get("email", "").casefold()
+    ]
+
+async def _enrich_applications(job_id: str, applications: List[dict]) -> List[dict]:
+    """Attach candidate, latest resume and ranking data to applications using batched reads."""
+    users_collection = get_collection("users")
+    resumes_collection = get_collection("resumes")
+    rankings_collection = get_collection("candidate_rankings")
+    
+    # Load candidates, latest resumes and rankings for all applications in batches
+    candidate_ids = [app["candidate_id"] for app in applications]
+    candidate_docs, latest_resumes, ranking_docs = await asyncio.gather(
+        users_collection.find_in("_id", candidate_ids, projection=PROJECTIONS["candidate_contact"]),
+        resumes_collection.find_latest_in(
+            "candidate_id", candidate_ids, projection=PROJECTIONS["resume_ref"]
+        ),
+        rankings_collection.find_in(
+            "candidate_id", candidate_ids, {"job_id": job_id}, projection=PROJECTIONS["ranking_score"]
+        )
+    )
+    candidates = {candidate["_id"]: candidate for candidate in candidate_docs}
+    rankings = {ranking["candidate_id"]: ranking for ranking in ranking_docs}
     
     # Enrich applications with candidate and ranking data
     enriched_applications = []
     for app in applications:
-        # Get candidate info
-        candidate = await users_collection.find_one({"_id": app["candidate_id"]})
-        
-        # Get resume info
-        resume = await resumes_collection.find_one(
-            {"candidate_id": app["candidate_id"]},
-            sort=[("created_at", -1)]
-        )
-        
-        # Get ranking info
-        ranking = await rankings_collection.find_one({
-            "candidate_id": app["candidate_id"],
-            "job_id": job_id
-        })
+        candidate = candidates.get(app["candidate_id"])
+        resume = latest_resumes.get(app["candidate_id"])
+        ranking = rankings.get(app["candidate_id"])
         
         enriched_app = {
             "id": app["_id"],
@@ -206,13 +385,7 @@ async def get_job_applications_with_details(
             "match_score": ranking["match_score"] if ranking else None
         }
         
-        enriched_applications.append(JobApplicationResponse(**enriched_app))
-    
-    # Sort by match score if available
-    enriched_applications.sort(
-        key=lambda x: x.match_score or 0,
-        reverse=True
-    )
+        enriched_applications.append(enriched_app)
     
     return enriched_applications
 
@@ -220,33 +393,14 @@ async def get_job_applications_with_details(
 async def update_application_status(
     application_id: str,
     status_data: dict,
-    current_user: dict = Depends(get_current_hr_user)
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Update application status (HR only)."""
     applications_collection = get_collection("applications")
     jobs_collection = get_collection("jobs")
     
-    # Get application
-    application = await applications_collection.find_one({"_id": application_id})
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
-    
-    # Check if job belongs to current HR
-    job = await jobs_collection.find_one({
-        "_id": application["job_id"],
-        "hr_id": current_user.user_id
-    })
-    
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
-    # Update application status
+    # Validate the new status
     new_status = status_data.get("status")
     valid_statuses = ["pending", "reviewed", "shortlisted", "rejected", "hired"]
     
@@ -256,17 +410,25 @@ async def update_application_status(
             detail=f"Invalid status. Must be one of: {valid_statuses}"
         )
     
-    result = await applications_collection.update_one(
-        {"_id": application_id},
-        {"$set": {"status": new_status}}
+    # Update the application only if its job belongs to current HR
+    application = await applications_collection.find_one_and_update(
+        {"_id": application_id, "hr_id": current_user.user_id},
+        {"$set": {"status": new_status}},
+        PROJECTIONS["application_job"]
     )
     
-    if result.modified_count == 0:
+    if not application:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update application status"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found or access denied"
         )
     
+    # Bumping the job's updated_at moves cached rankings for this job to a new key
+    await jobs_collection.update_one(
+        {"_id": application["job_id"]},
+        {"$set": {"updated_at": now}}
+    )
+    
     return {"message": f"Application status updated to {new_status}"}
 
 @router.get("/candidate/{candidate_id}/profile")
@@ -279,28 +441,26 @@ async def get_candidate_profile(
     resumes_collection = get_collection("resumes")
     applications_collection = get_collection("applications")
     
-    # Get candidate info
-    candidate = await users_collection.find_one({"_id": candidate_id})
+    # Candidate info, resume summaries, the full latest resume and the application
+    # count (COUNT aggregation, no documents transferred) are independent reads,
+    # so run them concurrently. Only the latest resume is loaded in full; the
+    # (candidate_id, created_at desc) index serves it as a one-document query.
+    candidate, resumes, latest_resumes, applications_count = await asyncio.gather(
+        users_collection.find_one({"_id": candidate_id}, PROJECTIONS["candidate_profile"]),
+        resumes_collection.find(
+            {"candidate_id": candidate_id}, PROJECTIONS["resume_summary"]
+        ).sort("created_at", -1).to_list(length=None),
+        resumes_collection.find({"candidate_id": candidate_id}).sort("created_at", -1).limit(1).to_list(length=1),
+        applications_collection.count_documents({"candidate_id": candidate_id})
+    )
+    
     if not candidate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
     
-    # Get candidate's resumes
-    resumes = await resumes_collection.find(
-        {"candidate_id": candidate_id}
-    ).to_list(length=None)
-    
-    # Get candidate's applications
-    applications = await applications_collection.find(
-        {"candidate_id": candidate_id}
-    ).to_list(length=None)
-    
-    # Get latest resume analysis
-    latest_resume = None
-    if resumes:
-        latest_resume = max(resumes, key=lambda x: x["created_at"])
+    latest_resume = latest_resumes[0] if latest_resumes else None
     
     return {
         "candidate": {
@@ -311,7 +471,7 @@ async def get_candidate_profile(
             "role": candidate["role"]
         },
         "resumes": resumes,
-        "applications_count": len(applications),
+        "applications_count": applications_count,
         "latest_resume": latest_resume
     }
 
@@ -331,23 +491,29 @@ async def search_candidates(
     # Build search query
     search_query = {"role": "candidate"}
     
+    # Search terms are matched literally, not as user-supplied regular expressions
     if query:
+        pattern = re.escape(query)
         search_query["$or"] = [
-            {"full_name": {"$regex": query, "$options": "i"}},
-            {"email": {"$regex": query, "$options": "i"}}
+            {"full_name": {"$regex": pattern, "$options": "i"}},
+            {"email": {"$regex": pattern, "$options": "i"}}
         ]
     
     # Get candidates
-    candidates = await users_collection.find(search_query).skip(skip).limit(limit).to_list(length=limit)
+    candidates = await users_collection.find(
+        search_query, PROJECTIONS["candidate_profile"]
+    ).skip(skip).limit(limit).to_list(length=limit)
+    
+    # Load every listed candidate's latest resume in one batched read
+    latest_resumes = await resumes_collection.find_latest_in(
+        "candidate_id", [candidate["_id"] for candidate in candidates],
+        projection=PROJECTIONS["resume_summary"]
+    )
     
     # Enrich with resume data
     enriched_candidates = []
     for candidate in candidates:
-        # Get latest resume
-        latest_resume = await resumes_collection.find_one(
-            {"candidate_id": candidate["_id"]},
-            sort=[("created_at", -1)]
-        )
+        latest_resume = latest_resumes.get(candidate["_id"])
         
         enriched_candidate = {
             "id": candidate["_id"],
@@ -3,33 +3,97 @@ Job management router for HR users.
 Handles job posting, updating, and candidate management.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-import uuid
+from collections import Counter
+import asyncio
+import logging
+import os
+import re
 
-from database.firebase_adapter import get_collection
+from database.firebase_adapter import get_collection, new_document_id, DuplicateKeyError, ReturnDocument
+from database.cache import query_cache, MISS
 from models.job import (
     JobCreate, JobUpdate, JobResponse, JobSearch, JobApplication,
     JobApplicationResponse, JobStatus, JobAnalytics, JobStatusUpdate,
-    JobCompletionNotification
+    JobCompletionNotification, JobListItem, JOB_LIST_FIELDS,
+    JobSummary, JOB_SUMMARY_FIELDS, JOB_RESPONSE_FIELDS, job_summary_adapter,
+    SEARCH_KEYWORD_FIELDS, MAX_SEARCH_TERMS, search_terms, job_search_keywords,
+    job_response_list_adapter, job_list_item_adapter, job_application_list_adapter
 )
 from auth.jwt_handler import get_current_hr_user, get_current_user
 from services.nlp_service import calculate_candidate_score
+from utils.request_time import get_request_time
+from utils.pagination import get_page_cursor, newest_first
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+# Optional job fields a client may clear by sending null
+NULLABLE_JOB_FIELDS = {"salary_min", "salary_max"}
+
+# Safety bound on the rows an unpaginated HR list endpoint loads into memory; the
+# NDJSON stream in the candidates router serves complete exports
+MAX_LIST_ROWS = 10000
+
+# Statuses a job can leave; completed jobs cannot be reactivated. An equality-style
+# 'in' filter needs no composite index, unlike a != on status
+REOPENABLE_JOB_STATUSES = [job_status.value for job_status in JobStatus if job_status != JobStatus.COMPLETED]
+
+# Job views are counted in memory and written by a background task as one batched
+# increment per interval, so viewing a job never writes; cached job reads are
+# invalidated once per flush instead of per view. Increments commute, so every
+# worker flushes its own buffer.
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "10"))  # seconds
+_pending_views: Counter = Counter()
+# Views being written by the current flush, still shown until the job cache is invalidated
+_flushing_views: Counter = Counter()
+
+def _record_view(job_id: str):
+    """Count a job view in memory."""
+    _pending_views[job_id] += 1
+
+async def _write_views(views: Counter):
+    """Write buffered view counts to Firestore."""
+    try:
+        await get_collection("jobs").bulk_increment("view_count", views)
+    except Exception as e:
+        logger.warning(f"Failed to write {sum(views.values())} job views: {e}")
+
+async def flush_job_views():
+    """Write every buffered view count now."""
+    global _pending_views, _flushing_views
+    if not _pending_views:
+        return
+    views, _pending_views = _pending_views, Counter()
+    _flushing_views = views
+    try:
+        await _write_views(views)
+    finally:
+        _flushing_views = Counter()
+
+async def run_view_flusher(stop: asyncio.Event):
+    """Flush buffered view counts every VIEW_FLUSH_INTERVAL seconds, and once more when stopped."""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), VIEW_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        await flush_job_views()
+
 @router.post("/", response_model=JobResponse)
 async def create_job(
     job_data: JobCreate,
-    current_user: dict = Depends(get_current_hr_user)
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Create a new job posting (HR only)."""
     jobs_collection = get_collection("jobs")
     
     # Create job document
-    job_id = str(uuid.uuid4())
-    now = datetime.utcnow()
+    job_id = new_document_id()
     completion_date = now + timedelta(days=job_data.auto_complete_days) if job_data.auto_complete_days else None
     
     job_doc = {
@@ -59,6 +123,7 @@ async def create_job(
         "completed_at": None,
         "is_auto_completed": False
     }
+    job_doc["search_keywords"] = job_search_keywords(job_doc)
     
     # Insert job into database
     result = await jobs_collection.insert_one(job_doc)
@@ -72,7 +137,7 @@ async def create_job(
     job_doc['id'] = job_doc['_id']
     return JobResponse(**job_doc)
 
-@router.get("/", response_model=List[JobResponse])
+@router.get("/", response_model=List[JobSummary])
 async def get_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=50),
@@ -82,46 +147,59 @@ async def get_jobs(
     """Get list of jobs with pagination and filtering."""
     jobs_collection = get_collection("jobs")
     
-    # Build filter query
-    filter_query = {}
-    if status_filter:
-        filter_query["status"] = status_filter
-    
-    # Get jobs with pagination
-    cursor = jobs_collection.find(filter_query).skip(skip).limit(limit)
-    jobs = await cursor.to_list(length=limit)
+    # Pages are cached under the jobs collection, so any job write invalidates them
+    cache_key = query_cache.make_key(
+        "jobs", "list", {"skip": skip, "limit": limit, "status": status_filter}
+    )
+    jobs = await query_cache.get(cache_key)
+    if jobs is MISS:
+        # Build filter query
+        filter_query = {}
+        if status_filter:
+            filter_query["status"] = status_filter
+        
+        # Get jobs with pagination, loading only the fields a job card shows
+        cursor = jobs_collection.find(filter_query, JOB_SUMMARY_FIELDS).skip(skip).limit(limit)
+        jobs = await cursor.to_list(length=limit)
+        
+        # Map _id to id for each job
+        for job in jobs:
+            job['id'] = job['_id']
+        await query_cache.set(cache_key, jobs)
     
-    # Map _id to id for each job
-    for job in jobs:
-        job['id'] = job['_id']
-    return [JobResponse(**job) for job in jobs]
+    return job_summary_adapter.validate_python(jobs)
 
-@router.get("/search", response_model=List[JobResponse])
+@router.get("/search", response_model=List[JobListItem])
 async def search_jobs(
-    query: Optional[str] = Query(None),
+    query: Optional[str] = Query(None, description=f"Words to match; at most {MAX_SEARCH_TERMS} distinct words"),
     location: Optional[str] = Query(None),
     job_type: Optional[str] = Query(None),
     experience_level: Optional[str] = Query(None),
-    skills: Optional[str] = Query(None),
+    skills: Optional[str] = Query(None, description=f"Comma-separated skills; at most {MAX_SEARCH_TERMS}"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
 ):
-    """Search jobs with various filters."""
+    """Search jobs with various filters; more than MAX_SEARCH_TERMS query words or skills is a 422."""
     jobs_collection = get_collection("jobs")
     
     # Build search query
     search_query = {"status": JobStatus.ACTIVE}
     
-    if query:
-        search_query["$or"] = [
-            {"title": {"$regex": query, "$options": "i"}},
-            {"description": {"$regex": query, "$options": "i"}},
-            {"company": {"$regex": query, "$options": "i"}}
-        ]
+    # Query words match the indexed search_keywords array (any word, like a text index)
+    # instead of scanning title/description/company with regular expressions
+    terms = search_terms(query) if query else []
+    skill_list = [skill.strip() for skill in skills.split(",") if skill.strip()] if skills else []
+    # Firestore caps array_contains_any values, so longer lists are rejected rather than cut
+    for name, values in (("query words", terms), ("skills", skill_list)):
+        if len(values) > MAX_SEARCH_TERMS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"At most {MAX_SEARCH_TERMS} {name} can be searched at once"
+            )
     
     if location:
-        search_query["location"] = {"$regex": location, "$options": "i"}
+        search_query["location"] = {"$regex": re.escape(location), "$options": "i"}
     
     if job_type:
         search_query["job_type"] = job_type
@@ -129,18 +207,25 @@ async def search_jobs(
     if experience_level:
         search_query["experience_level"] = experience_level
     
-    if skills:
-        skill_list = [skill.strip() for skill in skills.split(",")]
-        search_query["required_skills"] = {"$in": skill_list}
+    if skill_list:
+        search_query["required_skills"] = ("array_contains_any", skill_list)
+    
+    if terms:
+        if skill_list:
+            # Firestore allows one array-contains-any filter per query, so the
+            # keywords are checked client-side on the skill-filtered results
+            search_query["$and"] = [{"search_keywords": ("array_contains_any", terms)}]
+        else:
+            search_query["search_keywords"] = ("array_contains_any", terms)
     
     # Get jobs with pagination
-    cursor = jobs_collection.find(search_query).skip(skip).limit(limit)
+    cursor = jobs_collection.find(search_query, JOB_LIST_FIELDS).skip(skip).limit(limit)
     jobs = await cursor.to_list(length=limit)
     
     # Map _id to id for each job
     for job in jobs:
         job['id'] = job['_id']
-    return [JobResponse(**job) for job in jobs]
+    return job_list_item_adapter.validate_python(jobs)
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
@@ -150,18 +235,17 @@ async def get_job(
     """Get a specific job by ID."""
     jobs_collection = get_collection("jobs")
     
-    job = await jobs_collection.find_one({"_id": job_id})
+    # Served from the query cache until the job is written
+    job = await jobs_collection.find_one({"_id": job_id}, JOB_RESPONSE_FIELDS)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Increment view count
-    await jobs_collection.update_one(
-        {"_id": job_id},
-        {"$inc": {"view_count": 1}}
-    )
+    # Count the view in memory; the response includes views not yet written
+    _record_view(job_id)
+    job["view_count"] = job.get("view_count", 0) + _pending_views[job_id] + _flushing_views[job_id]
     
     # Map _id to id for Pydantic model
     job['id'] = job['_id']
@@ -171,45 +255,45 @@ async def get_job(
 async def update_job(
     job_id: str,
     job_update: JobUpdate,
-    current_user: dict = Depends(get_current_hr_user)
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Update a job posting (HR only)."""
     jobs_collection = get_collection("jobs")
     
-    # Check if job exists and belongs to current HR
-    job = await jobs_collection.find_one({
-        "_id": job_id,
-        "hr_id": current_user.user_id
-    })
+    # Only fields the client sent are written; explicit nulls are kept where the job allows them
+    update_data = {
+        field: value for field, value in job_update.model_dump(exclude_unset=True).items()
+        if value is not None or field in NULLABLE_JOB_FIELDS
+    }
+    update_data["updated_at"] = now
+    
+    # When every searchable field is sent, the keywords can go out with the same write
+    keywords_changed = any(field in update_data for field in SEARCH_KEYWORD_FIELDS)
+    if all(field in update_data for field in SEARCH_KEYWORD_FIELDS):
+        update_data["search_keywords"] = job_search_keywords(update_data)
+        keywords_changed = False
+    
+    # Check ownership, update and return the updated job in one call
+    updated_job = await jobs_collection.find_one_and_update(
+        {"_id": job_id, "hr_id": current_user.user_id},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
+    )
     
-    if not job:
+    if not updated_job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found or access denied"
         )
     
-    # Prepare update data
-    update_data = {"updated_at": datetime.utcnow()}
-    
-    # Add non-None fields to update
-    for field, value in job_update.dict().items():
-        if value is not None:
-            update_data[field] = value
-    
-    # Update job
-    result = await jobs_collection.update_one(
-        {"_id": job_id},
-        {"$set": update_data}
-    )
-    
-    if result.modified_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to update job"
+    # Otherwise rebuild the keywords from the merged job
+    if keywords_changed:
+        await jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"search_keywords": job_search_keywords(updated_job)}}
         )
     
-    # Return updated job
-    updated_job = await jobs_collection.find_one({"_id": job_id})
     # Map _id to id for Pydantic model
     updated_job['id'] = updated_job['_id']
     return JobResponse(**updated_job)
@@ -222,32 +306,32 @@ async def delete_job(
     """Delete a job posting (HR only)."""
     jobs_collection = get_collection("jobs")
     
-    # Check if job exists and belongs to current HR
-    job = await jobs_collection.find_one({
+    # Delete the job only if it belongs to current HR
+    result = await jobs_collection.delete_one({
         "_id": job_id,
         "hr_id": current_user.user_id
     })
     
-    if not job:
+    if result.get("deleted_count", 0) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found or access denied"
         )
     
-    # Delete job
-    result = await jobs_collection.delete_one({"_id": job_id})
-    
-    if result.deleted_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to delete job"
-        )
-    
     return {"message": "Job deleted successfully"}
 
-@router.get("/{job_id}/applications", response_model=List[JobApplicationResponse])
+# Applications are shaped to the API contract here, so the route skips response-model
+# re-validation; `responses` keeps the schema in the OpenAPI docs
+@router.get(
+    "/{job_id}/applications",
+    response_model=None,
+    responses={200: {"model": List[JobApplicationResponse]}}
+)
 async def get_job_applications(
     job_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; every application when omitted"),
+    page_after: Optional[list] = Depends(get_page_cursor),
     current_user: dict = Depends(get_current_hr_user)
 ):
     """Get applications for a specific job (HR only)."""
@@ -255,30 +339,38 @@ async def get_job_applications(
     users_collection = get_collection("users")
     resumes_collection = get_collection("resumes")
     
-    # Check if job belongs to current HR
+    # Check if job belongs to current HR while counting and loading a page of its
+    # applications; both are discarded unless the check passes
     jobs_collection = get_collection("jobs")
-    job = await jobs_collection.find_one({
-        "_id": job_id,
-        "hr_id": current_user.user_id
-    })
+    job, total, applications = await asyncio.gather(
+        jobs_collection.find_one({
+            "_id": job_id,
+            "hr_id": current_user.user_id
+        }, {"hr_id": 1}),
+        applications_collection.count_documents({"job_id": job_id}),
+        _application_page(job_id, page_after, limit)
+    )
     
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found or access denied"
         )
+    response.headers["X-Total-Count"] = str(total)
     
-    # Get applications for this job
-    applications = await applications_collection.find({"job_id": job_id}).to_list(length=None)
+    # Load candidates and their latest resumes for all applications in batches
+    candidate_ids = [app["candidate_id"] for app in applications]
+    candidate_docs, latest_resumes = await asyncio.gather(
+        users_collection.find_in("_id", candidate_ids, projection={"full_name": 1, "email": 1}),
+        resumes_collection.find_latest_in("candidate_id", candidate_ids, projection={"candidate_id": 1})
+    )
+    candidates = {candidate["_id"]: candidate for candidate in candidate_docs}
     
     # Enrich applications with candidate data
     enriched_applications = []
     for app in applications:
-        # Get candidate info
-        candidate = await users_collection.find_one({"_id": app["candidate_id"]})
-        
-        # Get resume info
-        resume = await resumes_collection.find_one({"candidate_id": app["candidate_id"]})
+        candidate = candidates.get(app["candidate_id"])
+        resume = latest_resumes.get(app["candidate_id"])
         
         enriched_app = {
             "id": app["_id"],
@@ -293,15 +385,26 @@ async def get_job_applications(
             "match_score": app.get("match_score")
         }
         
-        enriched_applications.append(JobApplicationResponse(**enriched_app))
+        enriched_applications.append(enriched_app)
     
     return enriched_applications
 
+async def _application_page(job_id: str, page_after: Optional[list], limit: Optional[int]) -> List[dict]:
+    """Load one page of a job's applications, newest first; limit=None loads the rest."""
+    # Sorted and paged by Firestore using the (job_id, application_date) index
+    cursor = get_collection("applications").find({"job_id": job_id}).sort(newest_first("application_date"))
+    if page_after is not None:
+        cursor = cursor.start_after(page_after)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    return await cursor.to_list(length=limit)
+
 @router.post("/{job_id}/apply")
 async def apply_to_job(
     job_id: str,
     application_data: dict,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Apply to a job (Candidate only)."""
     if current_user.role != "candidate":
@@ -314,46 +417,33 @@ async def apply_to_job(
     jobs_collection = get_collection("jobs")
     
     # Check if job exists and is active
-    job = await jobs_collection.find_one({
-        "_id": job_id,
-        "status": JobStatus.ACTIVE
-    })
-    
+    job = await jobs_collection.find_one({"_id": job_id, "status": JobStatus.ACTIVE}, {"hr_id": 1})
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found or not active"
         )
     
-    # Check if already applied
-    existing_application = await applications_collection.find_one({
-        "job_id": job_id,
-        "candidate_id": current_user.user_id
-    })
-    
-    if existing_application:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already applied to this job"
-        )
-    
-    # Create application
-    application_id = str(uuid.uuid4())
+    # One application per (job, candidate): the ID makes a concurrent duplicate insert fail
+    application_id = f"{job_id}_{current_user.user_id}"
     application_doc = {
         "_id": application_id,
         "job_id": job_id,
         "candidate_id": current_user.user_id,
+        # Denormalized so status updates can check ownership in their own filter
+        "hr_id": job["hr_id"],
         "cover_letter": application_data.get("cover_letter"),
-        "application_date": datetime.utcnow(),
+        "application_date": now,
         "status": "pending"
     }
     
     # Insert application
-    result = await applications_collection.insert_one(application_doc)
-    if not result.get("inserted_id"):
+    try:
+        await applications_collection.insert_one(application_doc)
+    except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to submit application"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already applied to this job"
         )
     
     # Update job application count
@@ -366,59 +456,79 @@ async def apply_to_job(
 
 @router.get("/hr/my-jobs", response_model=List[JobResponse])
 async def get_hr_jobs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; every job when omitted"),
+    page_after: Optional[list] = Depends(get_page_cursor),
     current_user: dict = Depends(get_current_hr_user)
 ):
-    """Get jobs posted by current HR user."""
+    """Get jobs posted by current HR user, newest first."""
     jobs_collection = get_collection("jobs")
     
-    jobs = await jobs_collection.find({"hr_id": current_user.user_id}).to_list(length=None)
+    # Sorted and paged by Firestore using the (hr_id, created_at) index, counted alongside
+    cursor = jobs_collection.find(
+        {"hr_id": current_user.user_id}, JOB_RESPONSE_FIELDS
+    ).sort(newest_first("created_at"))
+    if page_after is not None:
+        cursor = cursor.start_after(page_after)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    total, jobs = await asyncio.gather(
+        jobs_collection.count_documents({"hr_id": current_user.user_id}),
+        cursor.to_list(length=limit)
+    )
+    response.headers["X-Total-Count"] = str(total)
     
     # Map _id to id for each job
     for job in jobs:
         job['id'] = job['_id']
-    return [JobResponse(**job) for job in jobs]
+    return job_response_list_adapter.validate_python(jobs)
 
 @router.patch("/{job_id}/status", response_model=JobResponse)
 async def update_job_status(
     job_id: str,
     status_update: JobStatusUpdate,
-    current_user: dict = Depends(get_current_hr_user)
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Update job status (active/inactive/completed)."""
     jobs_collection = get_collection("jobs")
     
-    # Check if job exists and belongs to HR
-    job = await jobs_collection.find_one({"_id": job_id, "hr_id": current_user.user_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
-    
-    # Prevent reactivating completed jobs
-    if job.get("status") == JobStatus.COMPLETED and status_update.status != JobStatus.COMPLETED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot reactivate completed jobs"
-        )
-    
     # Update job status
     update_data = {
         "status": status_update.status,
-        "updated_at": datetime.utcnow()
+        "updated_at": now
     }
     
     # If completing job, set completion date
     if status_update.status == JobStatus.COMPLETED:
-        update_data["completed_at"] = datetime.utcnow()
-    
-    await jobs_collection.update_one(
-        {"_id": job_id},
-        {"$set": update_data}
+        update_data["completed_at"] = now
+    
+    # Check ownership, update and return the updated job in one call; completed
+    # jobs only match when they are being completed again
+    job_filter = {"_id": job_id, "hr_id": current_user.user_id}
+    if status_update.status != JobStatus.COMPLETED:
+        job_filter["status"] = {"$in": REOPENABLE_JOB_STATUSES}
+    updated_job = await jobs_collection.find_one_and_update(
+        job_filter,
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
     
-    # Get updated job
-    updated_job = await jobs_collection.find_one({"_id": job_id})
+    if not updated_job:
+        # Only the failure path reads the job again, to report why nothing matched
+        job = await jobs_collection.find_one(
+            {"_id": job_id, "hr_id": current_user.user_id}, {"status": 1}
+        )
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot reactivate completed jobs"
+        )
+    
     updated_job['id'] = updated_job['_id']
     return JobResponse(**updated_job)
 
@@ -431,45 +541,43 @@ async def get_job_analytics(
     jobs_collection = get_collection("jobs")
     applications_collection = get_collection("applications")
     
-    # Check if job exists and belongs to HR
-    job = await jobs_collection.find_one({"_id": job_id, "hr_id": current_user.user_id})
+    # Check ownership, count and tally the applications concurrently; the counts
+    # are discarded unless the job belongs to this HR
+    job, total_applications, (status_distribution, candidate_ids) = await asyncio.gather(
+        jobs_collection.find_one(
+            {"_id": job_id, "hr_id": current_user.user_id},
+            {"view_count": 1, "unique_view_count": 1, "created_at": 1, "updated_at": 1}
+        ),
+        applications_collection.count_documents({"job_id": job_id}),
+        _application_stats(job_id)
+    )
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Get applications for this job
-    applications = await applications_collection.find({"job_id": job_id}).to_list(length=None)
+    # Load the applicants' analytics fields with one batched $in read
+    candidate_docs = await get_collection("users").find_in(
+        "_id", candidate_ids, projection={"experience_level": 1, "location": 1}
+    )
+    candidates = {candidate["_id"]: candidate for candidate in candidate_docs}
     
     # Calculate analytics
-    total_applications = len(applications)
     unique_views = job.get("unique_view_count", 0)
     hr_views = job.get("view_count", 0) - unique_views
     application_rate = (total_applications / unique_views) if unique_views > 0 else 0.0
     
-    # Analyze applications
-    status_distribution = {}
-    experience_distribution = {}
-    location_distribution = {}
+    # Candidate info for additional analytics (applications whose candidate is gone are skipped)
+    applicant_profiles = [candidates[cid] for cid in candidate_ids if cid in candidates]
+    experience_distribution = dict(Counter(
+        candidate.get("experience_level", "unknown") for candidate in applicant_profiles
+    ))
+    location_distribution = dict(Counter(
+        candidate.get("location", "unknown") for candidate in applicant_profiles
+    ))
     all_skills = []
     
-    for app in applications:
-        # Status distribution
-        status = app.get("status", "pending")
-        status_distribution[status] = status_distribution.get(status, 0) + 1
-        
-        # Get candidate info for additional analytics
-        candidate = await get_collection("users").find_one({"_id": app["candidate_id"]})
-        if candidate:
-            # Experience distribution
-            exp_level = candidate.get("experience_level", "unknown")
-            experience_distribution[exp_level] = experience_distribution.get(exp_level, 0) + 1
-            
-            # Location distribution
-            location = candidate.get("location", "unknown")
-            location_distribution[location] = location_distribution.get(location, 0) + 1
-    
     # Get top skills from applications
     # This would need to be enhanced based on your resume analysis data
     
@@ -482,121 +590,143 @@ async def get_job_analytics(
         top_skills=all_skills[:10],  # Top 10 skills
         experience_distribution=experience_distribution,
         location_distribution=location_distribution,
-        status_distribution=status_distribution,
+        status_distribution=dict(status_distribution),
         created_at=job["created_at"],
         updated_at=job["updated_at"]
     )
     
     return analytics
 
+async def _application_stats(job_id: str) -> Tuple[Counter, List[str]]:
+    """
+    Count every application for a job by status, streaming only the projected fields.
+    
+    Applicant IDs are collected for the first MAX_LIST_ROWS applications only, which
+    bounds the profile lookup behind the experience and location distributions.
+    """
+    status_distribution = Counter()
+    candidate_ids = []
+    async for application in get_collection("applications").find(
+        {"job_id": job_id}, {"status": 1, "candidate_id": 1}
+    ):
+        status_distribution[application.get("status", "pending")] += 1
+        if len(candidate_ids) < MAX_LIST_ROWS:
+            candidate_ids.append(application["candidate_id"])
+    return status_distribution, candidate_ids
+
 @router.get("/{job_id}/candidates", response_model=List[JobApplicationResponse])
 async def get_job_candidates(
     job_id: str,
-    current_user: dict = Depends(get_current_hr_user)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; every candidate when omitted"),
+    page_after: Optional[list] = Depends(get_page_cursor),
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Get all candidates who applied to a specific job."""
     jobs_collection = get_collection("jobs")
     applications_collection = get_collection("applications")
     users_collection = get_collection("users")
     
-    # Check if job exists and belongs to HR
-    job = await jobs_collection.find_one({"_id": job_id, "hr_id": current_user.user_id})
+    # Check if job exists and belongs to HR while counting and loading a page of its applications
+    job, total, applications = await asyncio.gather(
+        jobs_collection.find_one({"_id": job_id, "hr_id": current_user.user_id}, {"hr_id": 1}),
+        applications_collection.count_documents({"job_id": job_id}),
+        _application_page(job_id, page_after, limit)
+    )
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
+    response.headers["X-Total-Count"] = str(total)
     
-    # Get applications with candidate details
-    applications = await applications_collection.find({"job_id": job_id}).to_list(length=None)
+    # Get candidate details for all applications in one batched read
+    candidate_docs = await users_collection.find_in(
+        "_id", [app["candidate_id"] for app in applications],
+        projection={"full_name": 1, "email": 1}
+    )
+    candidates = {candidate["_id"]: candidate for candidate in candidate_docs}
     
     candidate_applications = []
     for app in applications:
-        candidate = await users_collection.find_one({"_id": app["candidate_id"]})
+        candidate = candidates.get(app["candidate_id"])
         if candidate:
-            candidate_applications.append(JobApplicationResponse(
-                id=app["_id"],
-                job_id=app["job_id"],
-                candidate_id=app["candidate_id"],
-                candidate_name=candidate.get("full_name", "Unknown"),
-                candidate_email=candidate.get("email", "Unknown"),
-                cover_letter=app.get("cover_letter"),
-                application_date=app.get("application_date", datetime.utcnow()),
-                status=app.get("status", "pending"),
-                resume_id=app.get("resume_id"),
-                match_score=app.get("match_score")
-            ))
-    
-    return candidate_applications
+            candidate_applications.append({
+                "id": app["_id"],
+                "job_id": app["job_id"],
+                "candidate_id": app["candidate_id"],
+                "candidate_name": candidate.get("full_name", "Unknown"),
+                "candidate_email": candidate.get("email", "Unknown"),
+                "cover_letter": app.get("cover_letter"),
+                "application_date": app.get("application_date", now),
+                "status": app.get("status", "pending"),
+                "resume_id": app.get("resume_id"),
+                "match_score": app.get("match_score")
+            })
+    
+    # Validate the page in one call instead of one model per row
+    return job_application_list_adapter.validate_python(candidate_applications)
 
 @router.patch("/{job_id}/candidates/{candidate_id}/status")
 async def update_candidate_status(
     job_id: str,
     candidate_id: str,
-    status: str,
-    current_user: dict = Depends(get_current_hr_user)
+    new_status: str = Query(..., alias="status"),
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Update candidate application status."""
     applications_collection = get_collection("applications")
-    jobs_collection = get_collection("jobs")
-    
-    # Check if job exists and belongs to HR
-    job = await jobs_collection.find_one({"_id": job_id, "hr_id": current_user.user_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found"
-        )
     
-    # Update application status
+    # Update the application only if its job belongs to HR
     result = await applications_collection.update_one(
-        {"job_id": job_id, "candidate_id": candidate_id},
-        {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+        {"job_id": job_id, "candidate_id": candidate_id, "hr_id": current_user.user_id},
+        {"$set": {"status": new_status, "updated_at": now}}
     )
     
-    if result.matched_count == 0:
+    if result["matched_count"] == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
+            detail="Application not found or access denied"
         )
     
-    return {"message": f"Candidate status updated to {status}"}
+    return {"message": f"Candidate status updated to {new_status}"}
 
 @router.get("/hr/auto-complete-check")
 async def check_auto_complete_jobs(
-    current_user: dict = Depends(get_current_hr_user)
+    current_user: dict = Depends(get_current_hr_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Check and auto-complete jobs that have reached their completion date."""
     jobs_collection = get_collection("jobs")
-    now = datetime.utcnow()
     
-    # Find jobs that should be auto-completed
-    jobs_to_complete = await jobs_collection.find({
+    # Complete them all with batched writes instead of one update per job
+    completion = {
+        "status": JobStatus.COMPLETED,
+        "completed_at": now,
+        "is_auto_completed": True,
+        "updated_at": now
+    }
+    
+    # Stream the due jobs, loading only the fields reported back, and build the
+    # writes and the report in one pass
+    due_jobs = jobs_collection.find({
         "hr_id": current_user.user_id,
         "status": JobStatus.ACTIVE,
         "completion_date": {"$lte": now}
-    }).to_list(length=None)
+    }, {"title": 1, "completion_date": 1}).limit(MAX_LIST_ROWS)
     
+    updates = []
     completed_jobs = []
-    for job in jobs_to_complete:
-        # Update job status to completed
-        await jobs_collection.update_one(
-            {"_id": job["_id"]},
-            {
-                "$set": {
-                    "status": JobStatus.COMPLETED,
-                    "completed_at": now,
-                    "is_auto_completed": True,
-                    "updated_at": now
-                }
-            }
-        )
-        
+    async for job in due_jobs:
+        updates.append((job["_id"], completion))
         completed_jobs.append({
             "job_id": job["_id"],
             "title": job["title"],
             "completion_date": job["completion_date"]
         })
+    await jobs_collection.bulk_update(updates)
     
     return {
         "message": f"Auto-completed {len(completed_jobs)} jobs",
@@ -3,31 +3,47 @@ Resume management router for handling resume uploads, parsing, and analysis.
 Handles file uploads, NLP processing, and resume data management.
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends, UploadFile, File, Form
 from typing import List, Optional
-from datetime import datetime
-import uuid
+from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import logging
 import os
+import secrets
 import aiofiles
 from pathlib import Path
+from google.api_core.exceptions import NotFound
 
-from database.firebase_adapter import get_collection
+from database.firebase_adapter import get_collection, new_document_id, DuplicateKeyError
+from models.job import utc_now
 from models.resume import (
-    ResumeResponse, ResumeStatus, ParsedResumeData, ResumeAnalysis
+    ResumeResponse, ResumeStatus, ParsedResumeData, ResumeAnalysis,
+    resume_response_list_adapter
 )
 from auth.jwt_handler import get_current_candidate_user, get_current_user
 from services.nlp_service import parse_resume_file, calculate_candidate_score
+from utils.request_time import get_request_time
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = Path("uploads/resumes")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-@router.post("/upload", response_model=ResumeResponse)
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+# Uploads are copied to disk in chunks of this size rather than read into memory whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# A parse still marked PROCESSING after this long is assumed lost and may be queued again
+PARSE_STALE_AFTER = timedelta(minutes=10)
+
+@router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_candidate_user)
+    current_user: dict = Depends(get_current_candidate_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Upload and parse a resume file (Candidate only)."""
     resumes_collection = get_collection("resumes")
@@ -40,63 +56,101 @@ async def upload_resume(
             detail="Invalid file type. Only PDF, DOCX, and TXT files are allowed."
         )
     
-    # Validate file size (10MB limit)
-    file_size = 0
-    content = await file.read()
-    file_size = len(content)
-    await file.seek(0)  # Reset file pointer
-    
-    if file_size > 10 * 1024 * 1024:  # 10MB
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size too large. Maximum size is 10MB."
-        )
-    
+    file_path = None
     try:
         # Generate unique filename
         file_extension = file.filename.split('.')[-1].lower()
-        unique_filename = f"{current_user.user_id}_{uuid.uuid4().hex}.{file_extension}"
+        unique_filename = f"{current_user.user_id}_{secrets.token_hex(8)}.{file_extension}"
         file_path = UPLOAD_DIR / unique_filename
         
-        # Save file
+        # Stream the file to disk, hashing it on the way and stopping as soon as it
+        # passes the size limit
+        file_size = 0
+        digest = hashlib.sha256()
         async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="File size too large. Maximum size is 10MB."
+                    )
+                digest.update(chunk)
+                await f.write(chunk)
+        content_hash = digest.hexdigest()
         
-        # Create resume document
-        resume_id = str(uuid.uuid4())
+        # Create resume document, keyed by content so re-uploading the same file is
+        # caught by the insert itself
+        resume_id = f"{current_user.user_id}_{content_hash}"
         resume_doc = {
             "_id": resume_id,
             "candidate_id": current_user.user_id,
+            "content_hash": content_hash,
             "filename": file.filename,
             "file_path": str(file_path),
             "file_type": file_extension,
             "file_size": file_size,
-            "status": ResumeStatus.UPLOADED,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            # Parsing is queued as soon as the document exists
+            "status": ResumeStatus.PROCESSING,
+            "created_at": now,
+            "updated_at": now,
             "parsed_data": None,
             "analysis_score": None
         }
         
         # Insert resume into database
-        result = await resumes_collection.insert_one(resume_doc)
+        try:
+            result = await resumes_collection.insert_one(resume_doc)
+        except DuplicateKeyError:
+            # Same file uploaded before
+            existing = await resumes_collection.find_one({"_id": resume_id}, use_cache=False)
+            if not existing:
+                raise
+            existing["id"] = existing.pop("_id")
+            parse_in_flight = (
+                existing["status"] == ResumeStatus.PROCESSING
+                and existing["updated_at"] >= now - PARSE_STALE_AFTER
+            )
+            if existing["status"] == ResumeStatus.PROCESSED or parse_in_flight:
+                # Already parsed or still being parsed: return that resume as it is
+                os.remove(file_path)
+                return ResumeResponse(**existing)
+            
+            # The earlier parse failed, never started or went stale, so queue it again,
+            # from the stored copy while it is still on disk
+            if os.path.exists(existing["file_path"]):
+                os.remove(file_path)
+            else:
+                existing["file_path"] = str(file_path)
+            existing.update(status=ResumeStatus.PROCESSING, updated_at=now)
+            await resumes_collection.bulk_update([(resume_id, {
+                "status": ResumeStatus.PROCESSING,
+                "file_path": existing["file_path"],
+                "updated_at": now
+            })])
+            background_tasks.add_task(
+                parse_resume_async, resume_id, existing["file_path"], existing["file_type"]
+            )
+            return ResumeResponse(**existing)
         if not result.get("inserted_id"):
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save resume"
             )
         
-        # Start parsing process asynchronously
-        await parse_resume_async(resume_id, str(file_path), file_extension)
+        # Parse after the response is sent; clients poll the resume status
+        background_tasks.add_task(parse_resume_async, resume_id, str(file_path), file_extension)
         
         # Map _id to id for the response
         resume_doc["id"] = resume_doc.pop("_id")
         return ResumeResponse(**resume_doc)
         
     except Exception as e:
-        # Clean up file if database operation failed
-        if os.path.exists(file_path):
+        # Clean up file if saving it or the database operation failed
+        if file_path is not None and os.path.exists(file_path):
             os.remove(file_path)
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload resume: {str(e)}"
@@ -106,51 +160,27 @@ async def parse_resume_async(resume_id: str, file_path: str, file_type: str):
     """Parse resume asynchronously."""
     resumes_collection = get_collection("resumes")
     
+    # Uploads are stored as processing already, so only the outcome is written
+    update = {"status": ResumeStatus.FAILED}
     try:
-        # Update status to processing
-        await resumes_collection.update_one(
-            {"_id": resume_id},
-            {"$set": {"status": ResumeStatus.PROCESSING}}
-        )
-        
         # Parse resume using NLP service
         parse_result = await parse_resume_file(file_path, file_type)
-        
         if parse_result["success"]:
-            # Update resume with parsed data
-            await resumes_collection.update_one(
-                {"_id": resume_id},
-                {
-                    "$set": {
-                        "status": ResumeStatus.PROCESSED,
-                        "parsed_data": parse_result["parsed_data"],
-                        "updated_at": datetime.utcnow()
-                    }
-                }
-            )
-        else:
-            # Update status to failed
-            await resumes_collection.update_one(
-                {"_id": resume_id},
-                {
-                    "$set": {
-                        "status": ResumeStatus.FAILED,
-                        "updated_at": datetime.utcnow()
-                    }
-                }
-            )
-            
-    except Exception as e:
-        # Update status to failed
-        await resumes_collection.update_one(
-            {"_id": resume_id},
-            {
-                "$set": {
-                    "status": ResumeStatus.FAILED,
-                    "updated_at": datetime.utcnow()
-                }
+            update = {
+                "status": ResumeStatus.PROCESSED,
+                "parsed_data": parse_result["parsed_data"]
             }
-        )
+    except Exception:
+        # Any parsing error leaves the resume marked as failed
+        logger.exception(f"Parsing resume {resume_id} failed")
+    update["updated_at"] = utc_now()
+    
+    # One write by document ID, without the lookup update_one does first
+    try:
+        await resumes_collection.bulk_update([(resume_id, update)])
+    except NotFound:
+        # The resume was deleted while it was being parsed
+        logger.info(f"Resume {resume_id} was deleted before parsing finished")
 
 @router.get("/", response_model=List[ResumeResponse])
 async def get_candidate_resumes(
@@ -159,9 +189,15 @@ async def get_candidate_resumes(
     """Get all resumes for the current candidate."""
     resumes_collection = get_collection("resumes")
     
-    resumes = await resumes_collection.find({"candidate_id": current_user.user_id}).to_list(length=None)
+    # Newest first, sorted by Firestore using the (candidate_id, created_at) index
+    resumes = await resumes_collection.find(
+        {"candidate_id": current_user.user_id}
+    ).sort("created_at", -1).to_list(length=None)
     
-    return [ResumeResponse(**{**resume, "id": resume["_id"]}) for resume in resumes]
+    # Map _id to id for each resume
+    for resume in resumes:
+        resume["id"] = resume["_id"]
+    return resume_response_list_adapter.validate_python(resumes)
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
@@ -199,7 +235,7 @@ async def delete_resume(
     resume = await resumes_collection.find_one({
         "_id": resume_id,
         "candidate_id": current_user.user_id
-    })
+    }, {"file_path": 1})
     
     if not resume:
         raise HTTPException(
@@ -231,8 +267,12 @@ async def get_resume_analysis(
     resumes_collection = get_collection("resumes")
     analysis_collection = get_collection("resume_analysis")
     
-    # Check if resume exists
-    resume = await resumes_collection.find_one({"_id": resume_id})
+    # Load the resume (only what the access check and analysis read) and any stored
+    # analysis concurrently; the analysis is only returned once access is checked
+    resume, analysis = await asyncio.gather(
+        resumes_collection.find_one({"_id": resume_id}, {"candidate_id": 1, "parsed_data": 1}),
+        analysis_collection.find_one({"resume_id": resume_id})
+    )
     if not resume:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -246,9 +286,6 @@ async def get_resume_analysis(
             detail="Access denied"
         )
     
-    # Get analysis from database
-    analysis = await analysis_collection.find_one({"resume_id": resume_id})
-    
     if not analysis:
         # Generate analysis if not exists
         analysis = await generate_resume_analysis(resume_id, resume)
@@ -276,8 +313,9 @@ async def generate_resume_analysis(resume_id: str, resume: dict) -> dict:
         overall_score = (skills_score * 0.3 + experience_score * 0.4 + education_score * 0.2 + completeness_score * 0.1)
         
         # Generate analysis
+        # Keyed by resume ID, so a resume can only ever have one stored analysis
         analysis_doc = {
-            "_id": str(uuid.uuid4()),
+            "_id": resume_id,
             "resume_id": resume_id,
             "candidate_id": resume["candidate_id"],
             "overall_score": round(overall_score, 2),
@@ -289,18 +327,21 @@ async def generate_resume_analysis(resume_id: str, resume: dict) -> dict:
             "weaknesses": _generate_weaknesses(parsed_data),
             "suggestions": _generate_suggestions(parsed_data),
             "skill_gaps": _identify_skill_gaps(skills),
-            "analysis_date": datetime.utcnow()
+            "analysis_date": utc_now()
         }
         
-        # Save analysis
-        await analysis_collection.insert_one(analysis_doc)
+        # Save analysis; a concurrent request may have stored the same analysis first
+        try:
+            await analysis_collection.insert_one(analysis_doc)
+        except DuplicateKeyError:
+            pass
         
         return analysis_doc
         
     except Exception as e:
         # Return default analysis on error
         return {
-            "_id": str(uuid.uuid4()),
+            "_id": new_document_id(),
             "resume_id": resume_id,
             "candidate_id": resume["candidate_id"],
             "overall_score": 0.0,
@@ -312,7 +353,7 @@ async def generate_resume_analysis(resume_id: str, resume: dict) -> dict:
             "weaknesses": ["Unable to analyze resume"],
             "suggestions": ["Please try uploading a different format"],
             "skill_gaps": [],
-            "analysis_date": datetime.utcnow()
+            "analysis_date": utc_now()
         }
 
 def _generate_strengths(parsed_data: dict) -> List[str]:
@@ -363,14 +404,10 @@ def _generate_suggestions(parsed_data: dict) -> List[str]:
     
     return suggestions
 
+# Skills every resume is checked for, in the order gaps are reported
+COMMON_SKILLS = ("python", "javascript", "sql", "git", "communication")
+
 def _identify_skill_gaps(skills: List[str]) -> List[str]:
     """Identify potential skill gaps."""
-    common_skills = ["python", "javascript", "sql", "git", "communication"]
-    skill_gaps = []
-    
-    skills_lower = [skill.lower() for skill in skills]
-    for skill in common_skills:
-        if skill not in skills_lower:
-            skill_gaps.append(skill.title())
-    
-    return skill_gaps
+    skills_lower = frozenset(skill.lower() for skill in skills)
+    return [skill.title() for skill in COMMON_SKILLS if skill not in skills_lower]
@@ -4,17 +4,81 @@ Handles skill suggestions, gap analysis, and learning recommendations.
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
-from datetime import datetime
-import uuid
+from datetime import datetime, timedelta
+from collections import Counter
+import asyncio
+import hashlib
 
-from database.firebase_adapter import get_collection
+from database.firebase_adapter import get_collection, new_document_id
+from database.cache import query_cache, MISS
+from models.job import utc_now
 from models.resume import SkillRecommendation
 from auth.jwt_handler import get_current_candidate_user, get_current_user
 from services.nlp_service import nlp_service
+from utils.request_time import get_request_time
 
 router = APIRouter()
 
+# Resume fields the skill endpoints read; Firestore returns just the nested skills list
+RESUME_SKILLS_PROJECTION = {"parsed_data.skills": 1}
+
+# Job fields the market statistics are built from
+MARKET_STATS_FIELDS = ["required_skills", "preferred_skills", "location", "job_type"]
+
+# How long stored recommendations are served before the market is re-read
+RECOMMENDATION_MAX_AGE = timedelta(days=1)
+
+def _skills_hash(skills: List[str]) -> str:
+    """Hash a skill list independent of order and case, to detect resume changes."""
+    encoded = "\n".join(sorted({skill.lower() for skill in skills})).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def _fold_case(counts: Counter) -> Counter:
+    """Merge counts of skills that differ only in case under the lowercase name."""
+    folded = Counter()
+    for skill, count in counts.items():
+        folded[skill.lower()] += count
+    return folded
+
+async def _market_stats() -> Dict[str, Any]:
+    """
+    Aggregate skill, location and job type counts over all active jobs.
+    
+    The result is kept in the query cache under the jobs collection, so it is
+    shared between workers when Redis is configured and recomputed after any
+    job write or once the cache TTL passes.
+    """
+    cache_key = query_cache.make_key("jobs", "market_stats", None)
+    stats = await query_cache.get(cache_key)
+    if stats is not MISS:
+        return stats
+    
+    # Count while streaming the projected jobs, so no job list is held in memory.
+    # Skill lists are counted as-is (Counter counts in C) and case is folded once per
+    # distinct skill afterwards, rather than lowercasing every occurrence.
+    required_counts, preferred_counts = Counter(), Counter()
+    locations, job_types = Counter(), Counter()
+    total_jobs = 0
+    async for job in get_collection("jobs").find({"status": "active"}, MARKET_STATS_FIELDS):
+        required_counts.update(job.get("required_skills", []))
+        preferred_counts.update(job.get("preferred_skills", []))
+        locations[job.get("location", "Unknown")] += 1
+        job_types[job.get("job_type", "Unknown")] += 1
+        total_jobs += 1
+    
+    required_skills = _fold_case(required_counts)
+    stats = {
+        "required_skills": required_skills,
+        "all_skills": required_skills + _fold_case(preferred_counts),
+        "locations": locations,
+        "job_types": job_types,
+        "total_jobs": total_jobs
+    }
+    await query_cache.set(cache_key, stats)
+    return stats
+
 @router.get("/recommendations", response_model=SkillRecommendation)
 async def get_skill_recommendations(
     current_user: dict = Depends(get_current_candidate_user)
@@ -22,12 +86,15 @@ async def get_skill_recommendations(
     """Get skill recommendations for the current candidate."""
     recommendations_collection = get_collection("skill_recommendations")
     resumes_collection = get_collection("resumes")
-    jobs_collection = get_collection("jobs")
     
-    # Get candidate's latest resume
-    latest_resume = await resumes_collection.find_one(
-        {"candidate_id": current_user.user_id, "status": "processed"},
-        sort=[("created_at", -1)]
+    # Get candidate's latest resume and stored recommendations concurrently
+    latest_resume, existing_recommendations = await asyncio.gather(
+        resumes_collection.find_one(
+            {"candidate_id": current_user.user_id, "status": "processed"},
+            RESUME_SKILLS_PROJECTION,
+            sort=[("created_at", -1)]
+        ),
+        recommendations_collection.find_one({"_id": current_user.user_id})
     )
     
     if not latest_resume:
@@ -36,12 +103,13 @@ async def get_skill_recommendations(
             detail="No processed resume found. Please upload and process a resume first."
         )
     
-    # Check if recommendations already exist
-    existing_recommendations = await recommendations_collection.find_one({
-        "candidate_id": current_user.user_id
-    })
-    
-    if existing_recommendations:
+    # Reuse stored recommendations while they are recent and the resume skills are unchanged
+    skills = latest_resume.get("parsed_data", {}).get("skills", [])
+    if (
+        existing_recommendations
+        and existing_recommendations.get("skills_hash") == _skills_hash(skills)
+        and existing_recommendations["recommendation_date"] >= utc_now() - RECOMMENDATION_MAX_AGE
+    ):
         return SkillRecommendation(**existing_recommendations)
     
     # Generate new recommendations
@@ -62,27 +130,12 @@ async def generate_skill_recommendations(
         parsed_data = resume.get("parsed_data", {})
         current_skills = parsed_data.get("skills", [])
         
-        # Get market trends from job postings
-        jobs_collection = get_collection("jobs")
-        all_jobs = await jobs_collection.find({"status": "active"}).to_list(length=None)
-        
-        # Extract skills from job postings
-        job_skills = []
-        for job in all_jobs:
-            job_skills.extend(job.get("required_skills", []))
-            job_skills.extend(job.get("preferred_skills", []))
-        
-        # Find most in-demand skills
-        skill_frequency = {}
-        for skill in job_skills:
-            skill_lower = skill.lower()
-            skill_frequency[skill_lower] = skill_frequency.get(skill_lower, 0) + 1
-        
-        # Sort skills by frequency
-        sorted_skills = sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True)
+        # Most in-demand skills across active job postings
+        market_stats = await _market_stats()
+        sorted_skills = market_stats["all_skills"].most_common()
         
         # Get top skills not in candidate's current skills
-        current_skills_lower = [skill.lower() for skill in current_skills]
+        current_skills_lower = frozenset(skill.lower() for skill in current_skills)
         recommended_skills = []
         skill_importance = {}
         
@@ -97,89 +150,99 @@ async def generate_skill_recommendations(
         # Generate reasoning
         reasoning = generate_recommendation_reasoning(current_skills, recommended_skills[:10])
         
-        # Create recommendation document
-        recommendation_id = str(uuid.uuid4())
+        # Create recommendation document, keyed by candidate so each candidate has one
         recommendation_doc = {
-            "_id": recommendation_id,
+            "_id": candidate_id,
             "candidate_id": candidate_id,
             "recommended_skills": recommended_skills[:10],
             "skill_importance": skill_importance,
             "learning_resources": learning_resources,
-            "recommendation_date": datetime.utcnow(),
+            "recommendation_date": utc_now(),
+            "skills_hash": _skills_hash(current_skills),
             "reasoning": reasoning
         }
         
-        # Save recommendations
-        await recommendations_collection.insert_one(recommendation_doc)
+        # Save recommendations, replacing the candidate's previous ones
+        await recommendations_collection.replace_one(recommendation_doc)
         
         return SkillRecommendation(**recommendation_doc)
         
     except Exception as e:
         # Return default recommendations on error
         return SkillRecommendation(
-            id=str(uuid.uuid4()),
+            id=new_document_id(),
             candidate_id=candidate_id,
             recommended_skills=["Python", "JavaScript", "SQL", "Git", "Communication"],
             skill_importance={"Python": 50, "JavaScript": 45, "SQL": 40, "Git": 35, "Communication": 30},
             learning_resources={},
-            recommendation_date=datetime.utcnow(),
+            recommendation_date=utc_now(),
             reasoning=["Based on market trends and your current skills"]
         )
 
+# Learning resource templates by skill; {skill} is replaced with the skill as recommended
+_PROGRAMMING_RESOURCES = (
+    "Learn {skill} on Codecademy",
+    "Practice {skill} on LeetCode",
+    "Build projects with {skill}",
+    "Read {skill} documentation"
+)
+_DATABASE_RESOURCES = (
+    "SQL Tutorial on W3Schools",
+    "Practice SQL on HackerRank",
+    "Learn database design principles",
+    "Work with real databases"
+)
+_GIT_RESOURCES = (
+    "Git Tutorial on Atlassian",
+    "Practice Git commands",
+    "Contribute to open source projects",
+    "Learn GitHub workflows"
+)
+DEFAULT_RESOURCE_TEMPLATES = (
+    "Research {skill} best practices",
+    "Find {skill} tutorials online",
+    "Practice {skill} in real projects",
+    "Join {skill} communities"
+)
+RESOURCE_TEMPLATES = {
+    "python": _PROGRAMMING_RESOURCES,
+    "javascript": _PROGRAMMING_RESOURCES,
+    "java": _PROGRAMMING_RESOURCES,
+    "c++": _PROGRAMMING_RESOURCES,
+    "sql": _DATABASE_RESOURCES,
+    "database": _DATABASE_RESOURCES,
+    "git": _GIT_RESOURCES,
+    "github": _GIT_RESOURCES
+}
+
 def generate_learning_resources(skills: List[str]) -> Dict[str, List[str]]:
     """Generate learning resources for recommended skills."""
-    resources = {}
-    
-    for skill in skills:
-        skill_lower = skill.lower()
-        if skill_lower in ["python", "javascript", "java", "c++"]:
-            resources[skill] = [
-                f"Learn {skill} on Codecademy",
-                f"Practice {skill} on LeetCode",
-                f"Build projects with {skill}",
-                f"Read {skill} documentation"
-            ]
-        elif skill_lower in ["sql", "database"]:
-            resources[skill] = [
-                "SQL Tutorial on W3Schools",
-                "Practice SQL on HackerRank",
-                "Learn database design principles",
-                "Work with real databases"
-            ]
-        elif skill_lower in ["git", "github"]:
-            resources[skill] = [
-                "Git Tutorial on Atlassian",
-                "Practice Git commands",
-                "Contribute to open source projects",
-                "Learn GitHub workflows"
-            ]
-        else:
-            resources[skill] = [
-                f"Research {skill} best practices",
-                f"Find {skill} tutorials online",
-                f"Practice {skill} in real projects",
-                f"Join {skill} communities"
-            ]
-    
-    return resources
+    return {
+        skill: [
+            template.format(skill=skill)
+            for template in RESOURCE_TEMPLATES.get(skill.lower(), DEFAULT_RESOURCE_TEMPLATES)
+        ]
+        for skill in skills
+    }
 
 def generate_recommendation_reasoning(current_skills: List[str], recommended_skills: List[str]) -> List[str]:
     """Generate reasoning for skill recommendations."""
     reasoning = []
+    current_skills_lower = frozenset(skill.lower() for skill in current_skills)
     
     if len(current_skills) < 5:
         reasoning.append("You have limited technical skills. Adding more skills will improve your marketability.")
     
-    if "python" not in [skill.lower() for skill in current_skills]:
+    if "python" not in current_skills_lower:
         reasoning.append("Python is one of the most in-demand programming languages.")
     
-    if "javascript" not in [skill.lower() for skill in current_skills]:
+    if "javascript" not in current_skills_lower:
         reasoning.append("JavaScript is essential for web development roles.")
     
-    if "sql" not in [skill.lower() for skill in current_skills]:
+    if "sql" not in current_skills_lower:
         reasoning.append("SQL is required for most data-related positions.")
     
-    if "git" not in [skill.lower() for skill in current_skills]:
+    if "git" not in current_skills_lower:
         reasoning.append("Git is essential for version control and collaboration.")
     
     reasoning.append("These skills are frequently mentioned in job postings.")
@@ -187,52 +250,34 @@ def generate_recommendation_reasoning(current_skills: List[str], recommended_ski
     
     return reasoning
 
-@router.get("/market-trends")
+@router.get("/market-trends", response_model=None)
 async def get_market_trends(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Get current market trends for skills (available to all users)."""
-    jobs_collection = get_collection("jobs")
-    
-    # Get all active jobs
-    jobs = await jobs_collection.find({"status": "active"}).to_list(length=None)
-    
-    # Analyze skill trends
-    skill_frequency = {}
-    location_trends = {}
-    job_type_trends = {}
-    
-    for job in jobs:
-        # Count skills
-        for skill in job.get("required_skills", []):
-            skill_lower = skill.lower()
-            skill_frequency[skill_lower] = skill_frequency.get(skill_lower, 0) + 1
-        
-        # Count locations
-        location = job.get("location", "Unknown")
-        location_trends[location] = location_trends.get(location, 0) + 1
-        
-        # Count job types
-        job_type = job.get("job_type", "Unknown")
-        job_type_trends[job_type] = job_type_trends.get(job_type, 0) + 1
+    # Skill, location and job type counts over all active jobs
+    market_stats = await _market_stats()
     
     # Sort trends
-    top_skills = sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True)[:20]
-    top_locations = sorted(location_trends.items(), key=lambda x: x[1], reverse=True)[:10]
-    top_job_types = sorted(job_type_trends.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_skills = market_stats["required_skills"].most_common(20)
+    top_locations = market_stats["locations"].most_common(10)
+    top_job_types = market_stats["job_types"].most_common(10)
     
-    return {
+    # Plain counts and strings: encode directly, skipping jsonable_encoder
+    return ORJSONResponse(content={
         "top_skills": [{"skill": skill, "count": count} for skill, count in top_skills],
         "top_locations": [{"location": location, "count": count} for location, count in top_locations],
         "top_job_types": [{"job_type": job_type, "count": count} for job_type, count in top_job_types],
-        "total_jobs": len(jobs),
-        "analysis_date": datetime.utcnow()
-    }
+        "total_jobs": market_stats["total_jobs"],
+        "analysis_date": now
+    })
 
-@router.get("/skill-gap-analysis")
+@router.get("/skill-gap-analysis", response_model=None)
 async def get_skill_gap_analysis(
     job_id: Optional[str] = Query(None),
-    current_user: dict = Depends(get_current_candidate_user)
+    current_user: dict = Depends(get_current_candidate_user),
+    now: datetime = Depends(get_request_time)
 ):
     """Analyze skill gaps for a specific job or general market."""
     resumes_collection = get_collection("resumes")
@@ -241,6 +286,7 @@ async def get_skill_gap_analysis(
     # Get candidate's latest resume
     latest_resume = await resumes_collection.find_one(
         {"candidate_id": current_user.user_id, "status": "processed"},
+        RESUME_SKILLS_PROJECTION,
         sort=[("created_at", -1)]
     )
     
@@ -252,9 +298,12 @@ async def get_skill_gap_analysis(
     
     current_skills = latest_resume.get("parsed_data", {}).get("skills", [])
     
+    # Both branches return plain lists and counts, encoded directly without jsonable_encoder
     if job_id:
         # Analyze against specific job
-        job = await jobs_collection.find_one({"_id": job_id})
+        job = await jobs_collection.find_one(
+            {"_id": job_id}, {"title": 1, "required_skills": 1, "preferred_skills": 1}
+        )
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -265,120 +314,109 @@ async def get_skill_gap_analysis(
         preferred_skills = job.get("preferred_skills", [])
         
         # Find missing skills
-        current_skills_lower = [skill.lower() for skill in current_skills]
+        current_skills_lower = frozenset(skill.lower() for skill in current_skills)
         missing_required = [skill for skill in required_skills if skill.lower() not in current_skills_lower]
         missing_preferred = [skill for skill in preferred_skills if skill.lower() not in current_skills_lower]
         
-        return {
+        return ORJSONResponse(content={
             "job_id": job_id,
             "job_title": job.get("title"),
             "current_skills": current_skills,
             "missing_required_skills": missing_required,
             "missing_preferred_skills": missing_preferred,
             "match_percentage": calculate_skill_match_percentage(current_skills, required_skills)
-        }
+        })
     else:
-        # General market analysis
-        all_jobs = await jobs_collection.find({"status": "active"}).to_list(length=None)
-        
-        # Get all skills from jobs
-        all_skills = []
-        for job in all_jobs:
-            all_skills.extend(job.get("required_skills", []))
-            all_skills.extend(job.get("preferred_skills", []))
-        
-        # Find most common missing skills
-        skill_frequency = {}
-        for skill in all_skills:
-            skill_lower = skill.lower()
-            skill_frequency[skill_lower] = skill_frequency.get(skill_lower, 0) + 1
+        # General market analysis over the cached skill counts
+        market_stats = await _market_stats()
+        skill_frequency = market_stats["all_skills"]
         
         # Get skills not in candidate's current skills
-        current_skills_lower = [skill.lower() for skill in current_skills]
-        missing_skills = []
-        for skill, frequency in skill_frequency.items():
-            if skill not in current_skills_lower:
-                missing_skills.append({"skill": skill.title(), "frequency": frequency})
+        current_skills_lower = frozenset(skill.lower() for skill in current_skills)
+        # most_common is already ordered by frequency
+        missing_skills = [
+            {"skill": skill.title(), "frequency": frequency}
+            for skill, frequency in skill_frequency.most_common()
+            if skill not in current_skills_lower
+        ]
         
-        # Sort by frequency
-        missing_skills.sort(key=lambda x: x["frequency"], reverse=True)
-        
-        return {
+        return ORJSONResponse(content={
             "current_skills": current_skills,
             "missing_skills": missing_skills[:20],  # Top 20 missing skills
-            "total_jobs_analyzed": len(all_jobs),
-            "analysis_date": datetime.utcnow()
-        }
+            "total_jobs_analyzed": market_stats["total_jobs"],
+            "analysis_date": now
+        })
 
 def calculate_skill_match_percentage(current_skills: List[str], required_skills: List[str]) -> float:
     """Calculate percentage of required skills that candidate has."""
     if not required_skills:
         return 100.0
     
-    current_skills_lower = [skill.lower() for skill in current_skills]
-    required_skills_lower = [skill.lower() for skill in required_skills]
+    current_skills_lower = frozenset(skill.lower() for skill in current_skills)
     
-    matches = sum(1 for skill in required_skills_lower if skill in current_skills_lower)
-    return (matches / len(required_skills_lower)) * 100
+    matches = sum(1 for skill in required_skills if skill.lower() in current_skills_lower)
+    return (matches / len(required_skills)) * 100
+
+# Curated learning paths by lowercase skill name
+LEARNING_PATHS = {
+    "python": {
+        "beginner": [
+            "Learn Python basics on Codecademy",
+            "Practice with Python exercises on HackerRank",
+            "Build a simple calculator project",
+            "Learn about variables, loops, and functions"
+        ],
+        "intermediate": [
+            "Learn object-oriented programming",
+            "Practice with data structures",
+            "Build a web scraper",
+            "Learn about libraries like pandas and numpy"
+        ],
+        "advanced": [
+            "Learn about decorators and generators",
+            "Build a web application with Flask/Django",
+            "Practice with algorithms and data structures",
+            "Contribute to open source Python projects"
+        ]
+    },
+    "javascript": {
+        "beginner": [
+            "Learn JavaScript basics on MDN",
+            "Practice with JavaScript exercises",
+            "Build a simple interactive webpage",
+            "Learn about DOM manipulation"
+        ],
+        "intermediate": [
+            "Learn ES6+ features",
+            "Practice with frameworks like React or Vue",
+            "Build a single-page application",
+            "Learn about async programming"
+        ],
+        "advanced": [
+            "Learn about design patterns",
+            "Build a full-stack application",
+            "Practice with testing frameworks",
+            "Learn about performance optimization"
+        ]
+    }
+}
 
-@router.get("/learning-paths")
+@router.get("/learning-paths", response_model=None)
 async def get_learning_paths(
     skill: str = Query(..., description="Skill to get learning path for"),
     current_user: dict = Depends(get_current_user)
 ):
     """Get learning path for a specific skill."""
-    learning_paths = {
-        "python": {
-            "beginner": [
-                "Learn Python basics on Codecademy",
-                "Practice with Python exercises on HackerRank",
-                "Build a simple calculator project",
-                "Learn about variables, loops, and functions"
-            ],
-            "intermediate": [
-                "Learn object-oriented programming",
-                "Practice with data structures",
-                "Build a web scraper",
-                "Learn about libraries like pandas and numpy"
-            ],
-            "advanced": [
-                "Learn about decorators and generators",
-                "Build a web application with Flask/Django",
-                "Practice with algorithms and data structures",
-                "Contribute to open source Python projects"
-            ]
-        },
-        "javascript": {
-            "beginner": [
-                "Learn JavaScript basics on MDN",
-                "Practice with JavaScript exercises",
-                "Build a simple interactive webpage",
-                "Learn about DOM manipulation"
-            ],
-            "intermediate": [
-                "Learn ES6+ features",
-                "Practice with frameworks like React or Vue",
-                "Build a single-page application",
-                "Learn about async programming"
-            ],
-            "advanced": [
-                "Learn about design patterns",
-                "Build a full-stack application",
-                "Practice with testing frameworks",
-                "Learn about performance optimization"
-            ]
-        }
-    }
-    
+    # Static strings: encode directly, skipping jsonable_encoder
     skill_lower = skill.lower()
-    if skill_lower in learning_paths:
-        return {
+    if skill_lower in LEARNING_PATHS:
+        return ORJSONResponse(content={
             "skill": skill,
-            "learning_path": learning_paths[skill_lower],
+            "learning_path": LEARNING_PATHS[skill_lower],
             "recommended_duration": "3-6 months per level"
-        }
+        })
     else:
-        return {
+        return ORJSONResponse(content={
             "skill": skill,
             "learning_path": {
                 "beginner": [
@@ -401,4 +439,4 @@ async def get_learning_paths(
                 ]
             },
             "recommended_duration": "3-6 months per level"
-        }
+        })
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Search keyword backfill script.
+Adds the search_keywords array used by job search to existing jobs.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.firebase_connection import get_firebase_connection
+from models.job import SEARCH_KEYWORD_FIELDS, job_search_keywords
+
+async def backfill_search_keywords():
+    """Write search_keywords on every job whose stored keywords are missing or stale."""
+    firebase = await get_firebase_connection()
+    print("✅ Firebase connection established")
+    
+    jobs = firebase.get_collection("jobs").select([*SEARCH_KEYWORD_FIELDS, "search_keywords"])
+    updates = []
+    async for snapshot in jobs.stream():
+        job = snapshot.to_dict()
+        keywords = job_search_keywords(job)
+        if job.get("search_keywords") != keywords:
+            updates.append((snapshot.id, {"search_keywords": keywords}))
+    
+    await firebase.bulk_update("jobs", updates)
+    print(f"✅ Updated search keywords on {len(updates)} jobs")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_search_keywords())
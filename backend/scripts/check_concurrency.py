@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Firestore concurrency check.
+Verifies that concurrent adapter reads overlap instead of serializing.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.firebase_connection import get_firebase_connection
+from database.firebase_adapter import FirebaseCollection, FirebaseQuery, get_collection
+from database.cache import query_cache
+
+ADMIN_EMAIL = "admin@resumeanalyzer.com"
+
+async def timed_find_one(concurrency: int) -> float:
+    """Run `concurrency` find_one calls at once and return the wall time."""
+    users_collection = get_collection("users")
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        users_collection.find_one({"email": ADMIN_EMAIL}) for _ in range(concurrency)
+    ])
+    return time.perf_counter() - start
+
+async def check_concurrency():
+    """Compare one isolated find_one against two concurrent ones."""
+    firebase = await get_firebase_connection()
+    FirebaseCollection._firebase = firebase
+    FirebaseQuery._firebase = firebase
+    # Every call must reach Firestore for the timing to mean anything
+    query_cache.ttl = 0
+
+    # Warm up the channel so the handshake is not measured
+    await timed_find_one(1)
+
+    single = await timed_find_one(1)
+    concurrent = await timed_find_one(2)
+
+    print(f"Single find_one:      {single * 1000:.1f} ms")
+    print(f"Two concurrent calls: {concurrent * 1000:.1f} ms")
+
+    if concurrent < 2 * single:
+        print("✅ Concurrent Firestore reads overlap on the event loop")
+        return 0
+    print("❌ Concurrent Firestore reads are being serialized")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check_concurrency()))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Application re-key script.
+Moves applications stored under random IDs to the {job_id}_{candidate_id} ID
+that apply_to_job relies on to reject duplicate applications, and copies each
+job's hr_id onto its applications for the status update ownership checks.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database.firebase_connection import get_firebase_connection
+
+async def rekey_applications():
+    """Copy each legacy application to its deterministic ID and delete the original."""
+    firebase = await get_firebase_connection()
+    print("✅ Firebase connection established")
+
+    job_owners = {}
+    async for snapshot in firebase.get_collection("jobs").select(["hr_id"]).stream():
+        job_owners[snapshot.id] = snapshot.to_dict().get("hr_id")
+
+    applications = firebase.get_collection("applications")
+    documents = {}
+    async for snapshot in applications.stream():
+        documents[snapshot.id] = snapshot.to_dict()
+
+    # Keep the earliest application when a candidate applied to a job more than once
+    copies = {}
+    legacy_ids = []
+    owner_updates = []
+    for document_id, application in sorted(
+        documents.items(), key=lambda item: str(item[1].get("application_date", ""))
+    ):
+        hr_id = job_owners.get(application["job_id"])
+        target_id = f"{application['job_id']}_{application['candidate_id']}"
+        if document_id == target_id:
+            if application.get("hr_id") != hr_id:
+                owner_updates.append((document_id, {"hr_id": hr_id}))
+            continue
+        legacy_ids.append(document_id)
+        if target_id not in documents and target_id not in copies:
+            copies[target_id] = {**application, "_id": target_id, "hr_id": hr_id}
+
+    await firebase.bulk_set("applications", list(copies.items()))
+    await firebase.bulk_delete("applications", legacy_ids)
+    await firebase.bulk_update("applications", owner_updates)
+    print(f"✅ Re-keyed {len(copies)} applications, removed {len(legacy_ids) - len(copies)} duplicates")
+    print(f"✅ Set hr_id on {len(owner_updates)} applications")
+
+if __name__ == "__main__":
+    asyncio.run(rekey_applications())
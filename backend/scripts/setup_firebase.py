@@ -7,7 +7,7 @@ Creates initial data in Firebase Firestore.
 import asyncio
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add the parent directory to the path so we can import our modules
@@ -36,8 +36,8 @@ async def setup_firebase():
                 "company": "Resume Analyzer System",
                 "role": "hr",
                 "hashed_password": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj4J/4Qz8K8K",  # password123@
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
+                "created_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc),
                 "is_active": True
             }
             
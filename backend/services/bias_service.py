@@ -10,7 +10,7 @@ from typing import Dict, List, Any, Optional, Tuple
 import re
 import json
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from collections import Counter
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -318,10 +318,9 @@ class BiasDetectionService:
             bias_detection_rate = bias_detected_count / total_candidates
             
             # Analyze bias types
-            bias_types = defaultdict(int)
-            for log in recent_logs:
-                for bias_type in log.get('bias_indicators', {}):
-                    bias_types[bias_type] += 1
+            bias_types = Counter(
+                bias_type for log in recent_logs for bias_type in log.get('bias_indicators', {})
+            )
             
             # Calculate average bias scores
             avg_bias_score = np.mean([log.get('bias_score', 0) for log in recent_logs])
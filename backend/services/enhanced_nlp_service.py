@@ -306,9 +306,10 @@ class EnhancedNLPService:
         top_skills = market_trends.get('top_skills', [])
         
         # Find missing skills
+        current_skills_lower = frozenset(s.lower() for s in current_skills)
         missing_skills = []
         for skill in top_skills[:10]:  # Top 10 market skills
-            if skill['skill'].lower() not in [s.lower() for s in current_skills]:
+            if skill['skill'].lower() not in current_skills_lower:
                 missing_skills.append(skill['skill'])
         
         return {
@@ -39,18 +39,14 @@ class NLPService:
         
         try:
             # Load spaCy model
+            # Model loading is blocking, so run it in worker threads to let
+            # other startup tasks progress on the event loop meanwhile
             logger.info("Loading spaCy model...")
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except OSError:
-                logger.warning("spaCy model 'en_core_web_sm' not found. Using basic English model.")
-                self.nlp = spacy.blank("en")
-                # Add necessary components for basic processing
-                self.nlp.add_pipe("sentencizer")
+            self.nlp = await asyncio.to_thread(self._load_spacy_model)
             
             # Load sentence transformer model
             logger.info("Loading sentence transformer model...")
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.sentence_model = await asyncio.to_thread(SentenceTransformer, 'all-MiniLM-L6-v2')
             
             self.initialized = True
             logger.info("NLP models initialized successfully")
@@ -59,6 +55,17 @@ class NLPService:
             logger.error(f"Failed to initialize NLP models: {e}")
             raise e
     
+    def _load_spacy_model(self):
+        """Load the spaCy pipeline, falling back to a blank English model."""
+        try:
+            return spacy.load("en_core_web_sm")
+        except OSError:
+            logger.warning("spaCy model 'en_core_web_sm' not found. Using basic English model.")
+            nlp = spacy.blank("en")
+            # Add necessary components for basic processing
+            nlp.add_pipe("sentencizer")
+            return nlp
+    
     def _load_skill_keywords(self) -> Dict[str, List[str]]:
         """Load predefined skill keywords for different categories."""
         return {
@@ -95,18 +102,8 @@ class NLPService:
             await self.initialize()
         
         try:
-            # Extract text based on file type
-            if file_type.lower() == "pdf":
-                text = self._extract_text_from_pdf(file_path)
-            elif file_type.lower() in ["docx", "doc"]:
-                text = self._extract_text_from_docx(file_path)
-            else:
-                # Assume plain text
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-            
-            # Parse the text using NLP
-            parsed_data = await self._parse_text_with_nlp(text)
+            # Text extraction and the spaCy pipeline are CPU-bound, so run them off the event loop
+            text, parsed_data = await asyncio.to_thread(self._parse_file, file_path, file_type)
             
             return {
                 "success": True,
@@ -122,6 +119,21 @@ class NLPService:
                 "parsed_data": None
             }
     
+    def _parse_file(self, file_path: str, file_type: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract a resume's text and parse it with NLP (blocking)."""
+        # Extract text based on file type
+        if file_type.lower() == "pdf":
+            text = self._extract_text_from_pdf(file_path)
+        elif file_type.lower() in ["docx", "doc"]:
+            text = self._extract_text_from_docx(file_path)
+        else:
+            # Assume plain text
+            with open(file_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        
+        # Parse the text using NLP
+        return text, self._parse_text_with_nlp(text)
+    
     def _extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF file."""
         text = ""
@@ -139,7 +151,7 @@ class NLPService:
             text += paragraph.text + "\n"
         return text
     
-    async def _parse_text_with_nlp(self, text: str) -> Dict[str, Any]:
+    def _parse_text_with_nlp(self, text: str) -> Dict[str, Any]:
         """Parse text using spaCy NLP pipeline."""
         doc = self.nlp(text)
         
@@ -372,16 +384,86 @@ class NLPService:
                 "missing_skills": []
             }
     
+    async def calculate_candidate_scores(
+        self,
+        resume_list: List[Dict[str, Any]],
+        job_requirements: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Score many resumes against one job's requirements in a single vectorized pass."""
+        if not self.initialized:
+            await self.initialize()
+        
+        if not resume_list:
+            return []
+        
+        try:
+            job_skills = job_requirements.get("required_skills", [])
+            job_skills_lower = [skill.lower() for skill in job_skills]
+            
+            # Map each distinct required skill to an int32 id; resume skills outside it cannot match
+            skill_vocab: Dict[str, int] = {}
+            job_skill_ids = np.array(
+                [skill_vocab.setdefault(skill, len(skill_vocab)) for skill in job_skills_lower],
+                dtype=np.int32
+            )
+            
+            # Membership matrix: one row per resume, one column per distinct required skill
+            has_skill = np.zeros((len(resume_list), len(skill_vocab)), dtype=bool)
+            for row, resume_data in enumerate(resume_list):
+                skill_ids = [
+                    skill_vocab[skill] for skill in
+                    (skill.lower() for skill in resume_data.get("skills", []))
+                    if skill in skill_vocab
+                ]
+                has_skill[row, skill_ids] = True
+            
+            # Expand back to job skill order so duplicate requirements count as in the scalar path
+            matched = has_skill[:, job_skill_ids]
+            if job_skills:
+                skill_scores = matched.sum(axis=1) / len(job_skills) * 100
+            else:
+                skill_scores = np.zeros(len(resume_list))
+            
+            experience_counts = np.array([len(resume_data.get("experience", [])) for resume_data in resume_list])
+            experience_scores = np.minimum(experience_counts * 20, 100)
+            education_scores = np.array([
+                self._calculate_education_score(resume_data, job_requirements) for resume_data in resume_list
+            ])
+            
+            overall_scores = skill_scores * 0.4 + experience_scores * 0.4 + education_scores * 0.2
+            
+            results = []
+            for row in range(len(resume_list)):
+                results.append({
+                    "overall_score": round(float(overall_scores[row]), 2),
+                    "skill_score": round(float(skill_scores[row]), 2),
+                    "experience_score": round(float(experience_scores[row]), 2),
+                    "education_score": round(float(education_scores[row]), 2),
+                    "matched_skills": [skill for skill, hit in zip(job_skills, matched[row]) if hit],
+                    "missing_skills": [skill for skill, hit in zip(job_skills, matched[row]) if not hit]
+                })
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error calculating candidate scores: {e}")
+            return [{
+                "overall_score": 0,
+                "skill_score": 0,
+                "experience_score": 0,
+                "education_score": 0,
+                "matched_skills": [],
+                "missing_skills": []
+            } for _ in resume_list]
+    
     def _calculate_skill_match(self, resume_skills: List[str], job_skills: List[str]) -> float:
         """Calculate skill matching score."""
         if not job_skills:
             return 0.0
         
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
+        resume_skills_lower = frozenset(skill.lower() for skill in resume_skills)
         
-        matches = sum(1 for skill in job_skills_lower if skill in resume_skills_lower)
-        return (matches / len(job_skills_lower)) * 100
+        matches = sum(1 for skill in job_skills if skill.lower() in resume_skills_lower)
+        return (matches / len(job_skills)) * 100
     
     def _calculate_experience_score(self, resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> float:
         """Calculate experience score."""
@@ -409,27 +491,17 @@ class NLPService:
     
     def _get_matched_skills(self, resume_skills: List[str], job_skills: List[str]) -> List[str]:
         """Get skills that match between resume and job."""
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
+        resume_skills_lower = frozenset(skill.lower() for skill in resume_skills)
         
-        matched = []
-        for i, job_skill in enumerate(job_skills_lower):
-            if job_skill in resume_skills_lower:
-                matched.append(job_skills[i])  # Return original case
-        
-        return matched
+        # Return original case
+        return [skill for skill in job_skills if skill.lower() in resume_skills_lower]
     
     def _get_missing_skills(self, resume_skills: List[str], job_skills: List[str]) -> List[str]:
         """Get skills that are missing from resume."""
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
-        
-        missing = []
-        for i, job_skill in enumerate(job_skills_lower):
-            if job_skill not in resume_skills_lower:
-                missing.append(job_skills[i])  # Return original case
+        resume_skills_lower = frozenset(skill.lower() for skill in resume_skills)
         
-        return missing
+        # Return original case
+        return [skill for skill in job_skills if skill.lower() not in resume_skills_lower]
 
 # Global NLP service instance
 nlp_service = NLPService()
@@ -445,3 +517,7 @@ async def parse_resume_file(file_path: str, file_type: str) -> Dict[str, Any]:
 async def calculate_candidate_score(resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate candidate score."""
     return await nlp_service.calculate_candidate_score(resume_data, job_requirements)
+
+async def calculate_candidate_scores(resume_list: List[Dict[str, Any]], job_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Calculate candidate scores for a batch of resumes against one job."""
+    return await nlp_service.calculate_candidate_scores(resume_list, job_requirements)
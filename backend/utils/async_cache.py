@@ -0,0 +1,59 @@
+"""
+In-process TTL cache for async functions.
+Collapses repeated calls for slow-changing data into one call per TTL window.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+def async_ttl_cache(ttl: float = 300, maxsize: int = 64, key: Optional[Callable[..., tuple]] = None):
+    """
+    Cache an async function's result per argument tuple for `ttl` seconds.
+
+    Concurrent callers with the same arguments wait on one lock, so a cold
+    entry is computed once. Results are shared between callers and must be
+    treated as read-only. Exceptions are not cached. `key` maps the call
+    arguments to the cache key, for functions taking unhashable arguments.
+    """
+    def decorator(func):
+        cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+        locks: Dict[tuple, asyncio.Lock] = {}
+
+        def lookup(key: tuple):
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True, entry[1]
+            return False, None
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            hit, value = lookup(cache_key)
+            if hit:
+                return value
+
+            async with locks.setdefault(cache_key, asyncio.Lock()):
+                # Another caller may have filled the entry while we waited
+                hit, value = lookup(cache_key)
+                if hit:
+                    return value
+
+                value = await func(*args, **kwargs)
+                cache[cache_key] = (time.monotonic() + ttl, value)
+                cache.move_to_end(cache_key)
+                while len(cache) > maxsize:
+                    evicted, _ = cache.popitem(last=False)
+                    locks.pop(evicted, None)
+                return value
+
+        def cache_clear():
+            """Drop every cached result."""
+            cache.clear()
+            locks.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
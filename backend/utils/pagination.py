@@ -0,0 +1,27 @@
+"""
+Keyset pagination dependency.
+Lets newest-first list endpoints resume after the last row of the previous page
+instead of skipping an offset, which Firestore bills per skipped document.
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import HTTPException, Query, status
+
+def newest_first(sort_field: str) -> List[tuple]:
+    """Sort order for keyset pages: the timestamp, then the document ID, both descending."""
+    return [(sort_field, -1), ("__name__", -1)]
+
+def get_page_cursor(
+    before: Optional[datetime] = Query(None, description="Cursor: timestamp of the last row on the previous page"),
+    before_id: Optional[str] = Query(None, description="Cursor: ID of that row, to break timestamp ties"),
+) -> Optional[List[Any]]:
+    """Return the start_after values for a newest_first() query, or None for the first page."""
+    if before is None:
+        if before_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="before_id needs the matching before timestamp"
+            )
+        return None
+    return [before] if before_id is None else [before, before_id]
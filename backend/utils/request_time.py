@@ -0,0 +1,14 @@
+"""
+Per-request timestamp dependency.
+Lets a handler stamp every document it writes with one clock read.
+"""
+
+from datetime import datetime, timezone
+from fastapi import Request
+
+def get_request_time(request: Request) -> datetime:
+    """Return the UTC time the current request started, read once per request."""
+    now = getattr(request.state, "t0", None)
+    if now is None:
+        now = request.state.t0 = datetime.now(timezone.utc)
+    return now
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useParams } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from 'react-query';
 import { 
@@ -12,24 +12,74 @@ import {
   Target,
   Award
 } from 'lucide-react';
-import { candidatesAPI } from '../services/api';
+import { candidatesAPI, jobsAPI, toPage, nextPageCursor } from '../services/api';
 import toast from 'react-hot-toast';
 
+// Only the best-matched candidates are shown; the rest are counted
+const TOP_RANKINGS = 10;
+const APPLICATIONS_PER_PAGE = 20;
+// Search requests wait until typing pauses for this long
+const SEARCH_DELAY_MS = 300;
+
 const CandidateRanking = () => {
   const { jobId } = useParams();
   const [filterStatus, setFilterStatus] = useState('all');
   const [searchQuery, setSearchQuery] = useState('');
+  const [searchTerm, setSearchTerm] = useState('');
+  const [page, setPage] = useState(0);
+  // Cursor params for each visited page; pages resume after the previous page's last row
+  const [pageCursors, setPageCursors] = useState([{}]);
   const queryClient = useQueryClient();
 
-  const { data: rankings, isLoading } = useQuery(
+  const { data: rankingPage, isLoading } = useQuery(
     ['candidate-rankings', jobId],
-    () => candidatesAPI.getCandidateRankings(jobId)
+    () => candidatesAPI.getCandidateRankings(jobId, { limit: TOP_RANKINGS }).then(toPage)
   );
+  const rankings = rankingPage?.items;
+
+  // A new filter starts again from the first page
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setSearchTerm(searchQuery.trim());
+      setPage(0);
+      setPageCursors([{}]);
+    }, SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
+
+  const handleFilterStatusChange = (newStatus) => {
+    setFilterStatus(newStatus);
+    setPage(0);
+    setPageCursors([{}]);
+  };
 
-  const { data: applications, isLoading: applicationsLoading } = useQuery(
-    ['job-applications', jobId],
-    () => candidatesAPI.getJobApplications(jobId)
+  // Applications are filtered by the API and loaded one page at a time, newest first
+  const { data: applicationPage, isLoading: applicationsLoading } = useQuery(
+    ['job-applications', jobId, filterStatus, searchTerm, pageCursors[page]],
+    () => candidatesAPI.getJobApplications(jobId, {
+      status: filterStatus === 'all' ? undefined : filterStatus,
+      search: searchTerm || undefined,
+      limit: APPLICATIONS_PER_PAGE,
+      ...pageCursors[page]
+    }).then(toPage),
+    { keepPreviousData: true }
   );
+  const filteredApplications = applicationPage?.items || [];
+  const matchingApplications = applicationPage?.total || 0;
+  const pageCount = Math.ceil(matchingApplications / APPLICATIONS_PER_PAGE);
+
+  const goToNextPage = () => {
+    setPageCursors([...pageCursors.slice(0, page + 1), nextPageCursor(filteredApplications, 'application_date')]);
+    setPage(page + 1);
+  };
+
+  // Totals and status counts cover every application, whatever the filters
+  const { data: analytics } = useQuery(
+    ['job-analytics', jobId],
+    () => jobsAPI.getJobAnalytics(jobId).then((response) => response.data)
+  );
+  const totalApplications = analytics?.total_applications || 0;
+  const statusCounts = analytics?.status_distribution || {};
 
   const updateStatusMutation = useMutation(
     ({ applicationId, status }) => candidatesAPI.updateApplicationStatus(applicationId, { status }),
@@ -37,6 +87,7 @@ const CandidateRanking = () => {
       onSuccess: () => {
         toast.success('Application status updated');
         queryClient.invalidateQueries(['job-applications', jobId]);
+        queryClient.invalidateQueries(['job-analytics', jobId]);
       },
       onError: (error) => {
         toast.error(error.response?.data?.detail || 'Failed to update status');
@@ -48,14 +99,6 @@ const CandidateRanking = () => {
     updateStatusMutation.mutate({ applicationId, status: newStatus });
   };
 
-  const filteredApplications = applications?.filter(app => {
-    const matchesStatus = filterStatus === 'all' || app.status === filterStatus;
-    const matchesSearch = searchQuery === '' || 
-      app.candidate_name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      app.candidate_email.toLowerCase().includes(searchQuery.toLowerCase());
-    return matchesStatus && matchesSearch;
-  }) || [];
-
   const getStatusColor = (status) => {
     switch (status) {
       case 'shortlisted':
@@ -95,7 +138,7 @@ const CandidateRanking = () => {
         </div>
         <div className="flex items-center space-x-2">
           <span className="text-sm text-gray-500">
-            {applications?.length || 0} applications
+            {totalApplications} applications
           </span>
         </div>
       </div>
@@ -120,7 +163,7 @@ const CandidateRanking = () => {
               <Filter className="h-4 w-4 text-gray-400" />
               <select
                 value={filterStatus}
-                onChange={(e) => setFilterStatus(e.target.value)}
+                onChange={(e) => handleFilterStatusChange(e.target.value)}
                 className="input"
               >
                 <option value="all">All Status</option>
@@ -140,11 +183,13 @@ const CandidateRanking = () => {
         <div className="card">
           <div className="card-header">
             <h3 className="text-lg font-medium text-gray-900">AI-Powered Rankings</h3>
-            <p className="text-sm text-gray-600">Candidates ranked by match score</p>
+            <p className="text-sm text-gray-600">
+              Top {rankings.length} of {rankingPage.total} candidates ranked by match score
+            </p>
           </div>
           <div className="card-content">
             <div className="space-y-4">
-              {rankings.slice(0, 10).map((ranking, index) => (
+              {rankings.map((ranking) => (
                 <div key={ranking.candidate_id} className="flex items-center justify-between p-4 border border-gray-200 rounded-lg">
                   <div className="flex items-center space-x-4">
                     <div className="flex items-center justify-center w-8 h-8 bg-primary-100 text-primary-600 rounded-full font-medium">
@@ -249,11 +294,36 @@ const CandidateRanking = () => {
               </p>
             </div>
           )}
+
+          {/* Pagination */}
+          {pageCount > 1 && (
+            <div className="flex items-center justify-between mt-6">
+              <div className="flex items-center space-x-2">
+                <button
+                  onClick={() => setPage(Math.max(0, page - 1))}
+                  disabled={page === 0}
+                  className="px-3 py-2 text-sm font-medium text-gray-500 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                >
+                  Previous
+                </button>
+                <span className="text-sm text-gray-700">
+                  Page {page + 1} of {pageCount}
+                </span>
+                <button
+                  onClick={goToNextPage}
+                  disabled={page >= pageCount - 1}
+                  className="px-3 py-2 text-sm font-medium text-gray-500 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                >
+                  Next
+                </button>
+              </div>
+            </div>
+          )}
         </div>
       </div>
 
       {/* Summary Stats */}
-      {applications && applications.length > 0 && (
+      {totalApplications > 0 && (
         <div className="grid grid-cols-1 gap-4 sm:grid-cols-2 lg:grid-cols-4">
           <div className="card">
             <div className="card-content">
@@ -263,7 +333,7 @@ const CandidateRanking = () => {
                 </div>
                 <div className="ml-4">
                   <p className="text-sm font-medium text-gray-600">Total Applications</p>
-                  <p className="text-2xl font-semibold text-gray-900">{applications.length}</p>
+                  <p className="text-2xl font-semibold text-gray-900">{totalApplications}</p>
                 </div>
               </div>
             </div>
@@ -278,7 +348,7 @@ const CandidateRanking = () => {
                 <div className="ml-4">
                   <p className="text-sm font-medium text-gray-600">Shortlisted</p>
                   <p className="text-2xl font-semibold text-gray-900">
-                    {applications.filter(app => app.status === 'shortlisted').length}
+                    {statusCounts.shortlisted || 0}
                   </p>
                 </div>
               </div>
@@ -294,7 +364,7 @@ const CandidateRanking = () => {
                 <div className="ml-4">
                   <p className="text-sm font-medium text-gray-600">Reviewed</p>
                   <p className="text-2xl font-semibold text-gray-900">
-                    {applications.filter(app => app.status === 'reviewed').length}
+                    {statusCounts.reviewed || 0}
                   </p>
                 </div>
               </div>
@@ -310,7 +380,7 @@ const CandidateRanking = () => {
                 <div className="ml-4">
                   <p className="text-sm font-medium text-gray-600">Hired</p>
                   <p className="text-2xl font-semibold text-gray-900">
-                    {applications.filter(app => app.status === 'hired').length}
+                    {statusCounts.hired || 0}
                   </p>
                 </div>
               </div>
@@ -14,14 +14,20 @@ import {
   CheckCircle,
   Eye
 } from 'lucide-react';
-import { jobsAPI } from '../services/api';
+import { jobsAPI, toPage, nextPageCursor } from '../services/api';
 import toast from 'react-hot-toast';
 
+const JOBS_PER_PAGE = 20;
+
 const JobPosting = () => {
   const location = useLocation();
   const [showForm, setShowForm] = useState(false);
   const [editingJob, setEditingJob] = useState(null);
   const [jobs, setJobs] = useState([]);
+  const [page, setPage] = useState(0);
+  // Cursor params for each visited page; pages resume after the previous page's last job
+  const [pageCursors, setPageCursors] = useState([{}]);
+  const [totalJobs, setTotalJobs] = useState(0);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
   const queryClient = useQueryClient();
@@ -31,8 +37,15 @@ const JobPosting = () => {
     try {
       setIsLoading(true);
       setError(null);
-      const response = await jobsAPI.getHRJobs();
-      setJobs(response.data || []);
+      const response = await jobsAPI.getHRJobs({ limit: JOBS_PER_PAGE, ...pageCursors[page] });
+      const { items, total } = toPage(response);
+      // Step back when the last job on a later page was removed
+      if (items.length === 0 && page > 0) {
+        setPage(page - 1);
+        return;
+      }
+      setJobs(items);
+      setTotalJobs(total);
     } catch (err) {
       console.error('Error fetching jobs:', err);
       setError(err.message);
@@ -43,7 +56,14 @@ const JobPosting = () => {
 
   useEffect(() => {
     fetchJobs();
-  }, []);
+  }, [page]);
+
+  const pageCount = Math.ceil(totalJobs / JOBS_PER_PAGE);
+
+  const goToNextPage = () => {
+    setPageCursors([...pageCursors.slice(0, page + 1), nextPageCursor(jobs, 'created_at')]);
+    setPage(page + 1);
+  };
 
   // Check for create query parameter and automatically show form
   useEffect(() => {
@@ -565,6 +585,31 @@ const JobPosting = () => {
                     </div>
                   </div>
                 ))}
+
+                {/* Pagination */}
+                {pageCount > 1 && (
+                  <div className="flex items-center justify-between mt-6">
+                    <div className="flex items-center space-x-2">
+                      <button
+                        onClick={() => setPage(Math.max(0, page - 1))}
+                        disabled={page === 0}
+                        className="px-3 py-2 text-sm font-medium text-gray-500 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                      >
+                        Previous
+                      </button>
+                      <span className="text-sm text-gray-700">
+                        Page {page + 1} of {pageCount} ({totalJobs} jobs)
+                      </span>
+                      <button
+                        onClick={goToNextPage}
+                        disabled={page >= pageCount - 1}
+                        className="px-3 py-2 text-sm font-medium text-gray-500 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                      >
+                        Next
+                      </button>
+                    </div>
+                  </div>
+                )}
               </div>
             ) : (
               <div className="text-center py-12 px-6">
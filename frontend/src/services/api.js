@@ -34,6 +34,18 @@ api.interceptors.response.use(
   }
 );
 
+// Paged list endpoints return one page and report the full result size in X-Total-Count
+export const toPage = (response) => ({
+  items: response.data || [],
+  total: Number(response.headers['x-total-count'] ?? (response.data || []).length),
+});
+
+// Cursor params for the page after `items` of a newest-first list sorted on `sortField`
+export const nextPageCursor = (items, sortField) => {
+  const last = items[items.length - 1];
+  return last ? { before: last[sortField], before_id: last.id } : {};
+};
+
 // Auth API
 export const authAPI = {
   login: (email, password) => api.post('/api/auth/login', { email, password }),
@@ -52,14 +64,14 @@ export const jobsAPI = {
   createJob: (jobData) => api.post('/api/jobs', jobData),
   updateJob: (jobId, jobData) => api.put(`/api/jobs/${jobId}`, jobData),
   deleteJob: (jobId) => api.delete(`/api/jobs/${jobId}`),
-  getHRJobs: () => api.get('/api/jobs/hr/my-jobs'),
-  getJobApplications: (jobId) => api.get(`/api/jobs/${jobId}/applications`),
+  getHRJobs: (params = {}) => api.get('/api/jobs/hr/my-jobs', { params }),
+  getJobApplications: (jobId, params = {}) => api.get(`/api/jobs/${jobId}/applications`, { params }),
   applyToJob: (jobId, applicationData) => api.post(`/api/jobs/${jobId}/apply`, applicationData),
   
   // New job management endpoints
   updateJobStatus: (jobId, statusData) => api.patch(`/api/jobs/${jobId}/status`, statusData),
   getJobAnalytics: (jobId) => api.get(`/api/jobs/${jobId}/analytics`),
-  getJobCandidates: (jobId) => api.get(`/api/jobs/${jobId}/candidates`),
+  getJobCandidates: (jobId, params = {}) => api.get(`/api/jobs/${jobId}/candidates`, { params }),
   updateCandidateStatus: (jobId, candidateId, status) => 
     api.patch(`/api/jobs/${jobId}/candidates/${candidateId}/status`, { status }),
   checkAutoCompleteJobs: () => api.get('/api/jobs/hr/auto-complete-check'),
@@ -78,8 +90,8 @@ export const resumesAPI = {
 
 // Candidates API
 export const candidatesAPI = {
-  getCandidateRankings: (jobId) => api.get(`/api/candidates/job/${jobId}/rankings`),
-  getJobApplications: (jobId) => api.get(`/api/candidates/job/${jobId}/applications`),
+  getCandidateRankings: (jobId, params = {}) => api.get(`/api/candidates/job/${jobId}/rankings`, { params }),
+  getJobApplications: (jobId, params = {}) => api.get(`/api/candidates/job/${jobId}/applications`, { params }),
   updateApplicationStatus: (applicationId, statusData) => 
     api.put(`/api/candidates/applications/${applicationId}/status`, statusData),
   getCandidateProfile: (candidateId) => api.get(`/api/candidates/candidate/${candidateId}/profile`),